@@ -6,15 +6,49 @@ import logging
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import DOMAIN
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.typing import ConfigType
+
+from .connection import ConnectionManager
+from .const import (
+    CONF_IDLE_TIMEOUT,
+    CONF_STATE_WRITE_RATE,
+    DATA_CONNECTION_MANAGER,
+    DATA_DEVICE_INFO_CACHE,
+    DATA_FLEET,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_STATE_WRITE_RATE,
+    DOMAIN,
+)
 from .device import FlowerLightDevice
+from .events import DeviceEvent
+from .fleet import FlowerFleet
+from .light import async_ensure_fleet_light
+from .storage import DeviceInfoCache
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.SENSOR, Platform.NUMBER]
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.LIGHT,
+    Platform.SENSOR,
+    Platform.NUMBER,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Flower Light integration."""
+    cache = DeviceInfoCache(hass)
+    await cache.async_load()
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data[DATA_DEVICE_INFO_CACHE] = cache
+    domain_data[DATA_CONNECTION_MANAGER] = ConnectionManager()
+    domain_data[DATA_FLEET] = FlowerFleet()
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -43,28 +77,137 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         name=entry.title,
     )
 
-    # Connect to device
-    try:
-        if not await device.connect():
-            raise ConfigEntryNotReady(f"Could not connect to Flower Light at {address}")
-    except Exception as e:
-        _LOGGER.error("Error connecting to device: %s", e, exc_info=True)
-        raise ConfigEntryNotReady(f"Could not connect to Flower Light at {address}: {e}")
+    # Restore cached device info so entities register with full device_info
+    # and the connect sequence can skip reads while the firmware is unchanged
+    cache: DeviceInfoCache = hass.data[DOMAIN][DATA_DEVICE_INFO_CACHE]
+    if cached_info := cache.async_get(address):
+        device.restore_device_info(cached_info)
+    device.set_settle_hint(cache.async_get_settle_time(device.firmware_version))
+    device.set_state_write_rate(
+        entry.options.get(CONF_STATE_WRITE_RATE, DEFAULT_STATE_WRITE_RATE)
+    )
+
+    # Connect through the shared manager, which drops idle links and evicts
+    # the least recently used flower when the adapter runs out of slots
+    manager: ConnectionManager = hass.data[DOMAIN][DATA_CONNECTION_MANAGER]
+    manager.register(
+        device, entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+    )
 
     # Store device instance
-    hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = device
+    hass.data[DOMAIN][DATA_FLEET].add(device)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    # Every connect refines the cached info and the settle time learned for
+    # the firmware, which the next connect waits for
+    recorded_connects = 0
+
+    @callback
+    def _async_connection_changed() -> None:
+        nonlocal recorded_connects
+        if not device.is_connected or device.connect_count == recorded_connects:
+            return
+        recorded_connects = device.connect_count
+        cache.async_update(device.address, device.device_info_data)
+        cache.async_record_settle_time(device.firmware_version, device.settle_time)
+        device.set_settle_hint(cache.async_get_settle_time(device.firmware_version))
+
+    entry.async_on_unload(
+        device.subscribe(DeviceEvent.CONNECTION, _async_connection_changed)
+    )
+
+    # Advertisements trigger reconnects and tell whether the flower is in range
+    @callback
+    def _async_advertisement(
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        device.update_from_advertisement(
+            service_info.device if service_info.connectable else None,
+            service_info.rssi,
+        )
+        manager.device_seen(device)
+
+    @callback
+    def _async_unavailable(service_info: bluetooth.BluetoothServiceInfoBleak) -> None:
+        device.set_away()
+
+    entry.async_on_unload(
+        bluetooth.async_register_callback(
+            hass,
+            _async_advertisement,
+            bluetooth.BluetoothCallbackMatcher(address=ble_device.address, connectable=False),
+            bluetooth.BluetoothScanningMode.PASSIVE,
+        )
+    )
+    entry.async_on_unload(
+        bluetooth.async_track_unavailable(
+            hass, _async_unavailable, ble_device.address, connectable=True
+        )
+    )
 
-    # Forward to platforms
+    # Forward to platforms; entities stay unavailable until the device connects
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Connect in the background so setup doesn't wait for the BLE handshake
+    entry.async_create_background_task(
+        hass, _async_connect(hass, entry, device), f"{DOMAIN} connect {address}"
+    )
+
     return True
 
 
+async def _async_connect(
+    hass: HomeAssistant, entry: ConfigEntry, device: FlowerLightDevice
+) -> None:
+    """Connect a device after setup and register the info it read."""
+    manager: ConnectionManager = hass.data[DOMAIN][DATA_CONNECTION_MANAGER]
+    await manager.async_connect_in_background(device)
+
+    # Entities registered the device before its info was known on first setup
+    registry = dr.async_get(hass)
+    if registry_device := registry.async_get_device(identifiers={(DOMAIN, entry.unique_id)}):
+        registry.async_update_device(
+            registry_device.id,
+            manufacturer=device.manufacturer or "Unknown",
+            model=device.model or "Flower Light",
+            sw_version=device.firmware_version,
+            serial_number=device.serial_number,
+        )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         device: FlowerLightDevice = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN][DATA_CONNECTION_MANAGER].unregister(device)
         await device.disconnect()
 
+        fleet: FlowerFleet = hass.data[DOMAIN][DATA_FLEET]
+        fleet.remove(device)
+        fleet.platforms.pop(entry.entry_id, None)
+        # The fleet light goes away with the entry that added it, hand it over
+        async_ensure_fleet_light(fleet)
+
     return unload_ok
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options."""
+    device: FlowerLightDevice = hass.data[DOMAIN][entry.entry_id]
+    manager: ConnectionManager = hass.data[DOMAIN][DATA_CONNECTION_MANAGER]
+    manager.set_idle_timeout(
+        device, entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+    )
+    device.set_state_write_rate(
+        entry.options.get(CONF_STATE_WRITE_RATE, DEFAULT_STATE_WRITE_RATE)
+    )
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget cached device info when a config entry is removed."""
+    address = entry.unique_id or entry.data.get(CONF_ADDRESS)
+    cache: DeviceInfoCache | None = hass.data.get(DOMAIN, {}).get(DATA_DEVICE_INFO_CACHE)
+    if address and cache:
+        cache.async_remove(address)
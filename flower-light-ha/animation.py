@@ -0,0 +1,106 @@
+"""Host-driven animation helpers for Flower Light."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TickScheduler:
+    """Run frames on a fixed tick measured from the start, without drift.
+
+    Each frame is due at ``start + index * tick``, so the time spent writing a
+    frame does not push the following ones back. When a slow link falls more
+    than one tick behind, the stale frames are skipped instead of queued.
+    """
+
+    def __init__(self, tick_seconds: float) -> None:
+        """Initialize the scheduler."""
+        self.tick_seconds = tick_seconds
+        self.sent = 0
+        self.skipped = 0
+        self._started: float | None = None
+
+    @property
+    def requested_rate(self) -> float:
+        """Return the requested frames per second."""
+        return 1 / self.tick_seconds
+
+    @property
+    def achieved_rate(self) -> float | None:
+        """Return the frames per second actually sent since the start."""
+        if self._started is None:
+            return None
+        elapsed = time.monotonic() - self._started
+        if elapsed <= 0:
+            return None
+        return self.sent / elapsed
+
+    async def run(self, frame: Callable[[int], Awaitable[None]]) -> None:
+        """Call ``frame`` with the frame index on every tick until cancelled."""
+        tick = self.tick_seconds
+        self._started = started = time.monotonic()
+        self.sent = self.skipped = 0
+        index = 0
+        while True:
+            await frame(index)
+            self.sent += 1
+            index += 1
+
+            now = time.monotonic()
+            behind = now - (started + index * tick)
+            if behind > tick:
+                # Write backlog exceeds a tick: drop frames that are already stale
+                stale = int(behind // tick)
+                index += stale
+                self.skipped += stale
+                _LOGGER.debug("Skipped %s stale frames, %.2fs behind", stale, behind)
+            await asyncio.sleep(max(0.0, started + index * tick - now))
+
+
+class WindWaveform:
+    """Petal levels of the wind animation, computed one cycle at a time."""
+
+    def __init__(
+        self,
+        min_open: int,
+        max_open: int,
+        cycle_seconds: float,
+        tick_seconds: float,
+    ) -> None:
+        """Initialize the waveform."""
+        self.min_open = min_open
+        self.max_open = max_open
+        self.cycle_seconds = cycle_seconds
+        self.tick_seconds = tick_seconds
+        self.frames_per_cycle = max(1, round(cycle_seconds / tick_seconds))
+        self._cycle = -1
+        self._levels: list[int] = []
+
+    def level(self, index: int) -> int:
+        """Return the petal level of a frame."""
+        cycle, frame = divmod(index, self.frames_per_cycle)
+        if cycle != self._cycle:
+            self._levels = self._compute_cycle(cycle)
+            self._cycle = cycle
+        return self._levels[frame]
+
+    def _compute_cycle(self, cycle: int) -> list[int]:
+        """Compute the petal levels of every frame in a cycle."""
+        omega = 2 * math.pi / self.cycle_seconds
+        span = self.max_open - self.min_open
+        first = cycle * self.frames_per_cycle
+        levels = []
+        for frame in range(first, first + self.frames_per_cycle):
+            phase = frame * self.tick_seconds * omega
+            base_wave = (math.sin(phase) + 1.0) / 2.0
+            gust_wave = (math.sin(phase * 0.47 + 1.2) + 1.0) / 2.0
+            jitter = (random.random() - 0.5) * 0.1
+            smooth = max(0.0, min(1.0, base_wave * 0.78 + gust_wave * 0.22 + jitter))
+            levels.append(round(self.min_open + span * smooth))
+        return levels
@@ -0,0 +1,284 @@
+"""Benchmarks of the Flower Light hot paths against simulated flowers.
+
+Run from the repository with the integration's requirements (bleak,
+bleak-retry-connector, msgpack) installed; Home Assistant is not needed:
+
+    python flower-light-ha/benchmarks/bench.py            # compare to baselines
+    python flower-light-ha/benchmarks/bench.py --save     # store new baselines
+
+Every metric is a time, lower is better. A metric more than ``--tolerance``
+above its baseline is reported as a regression and fails the run.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+from pathlib import Path
+import statistics
+import sys
+import time
+import timeit
+import types
+from typing import Any, Awaitable, Callable
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASELINES = BENCH_DIR / "baselines.json"
+
+# Import the integration modules without Home Assistant: register the
+# integration directory as a package without running its __init__.py
+_PACKAGE = "flower_light"
+if _PACKAGE not in sys.modules:
+    _module = types.ModuleType(_PACKAGE)
+    _module.__path__ = [str(BENCH_DIR.parent)]
+    sys.modules[_PACKAGE] = _module
+
+const = importlib.import_module(f"{_PACKAGE}.const")
+device_module = importlib.import_module(f"{_PACKAGE}.device")
+fleet_module = importlib.import_module(f"{_PACKAGE}.fleet")
+protocol = importlib.import_module(f"{_PACKAGE}.protocol")
+simulator = importlib.import_module(f"{_PACKAGE}.simulator")
+
+FlowerLightDevice = device_module.FlowerLightDevice
+FlowerFleet = fleet_module.FlowerFleet
+SimulatedFlower = simulator.SimulatedFlower
+SimulatorConfig = simulator.SimulatorConfig
+
+# Simulated radio timing, roughly a local adapter with a 30 ms interval
+LINK = {
+    "connect_latency": 0.2,
+    "read_latency": 0.03,
+    "write_latency": 0.03,
+    "notify_latency": 0.015,
+    "jitter": 0.01,
+}
+
+FLEET_SIZES = (1, 10, 100)
+
+# Full CMD_WRITE_STATE as sent by turn_on
+STATE_PAYLOAD = {"l": 50, "r": 255, "g": 128, "b": 0, "t": 1000}
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    """Return a percentile of the samples (nearest rank)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _per_call_us(func: Callable[[], Any], number: int) -> float:
+    """Return the best time per call in microseconds over a few repeats."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def _flower(index: int = 0, **config: Any) -> SimulatedFlower:
+    """Create a seeded simulated flower with a unique address."""
+    settings = {**LINK, "seed": index, **config}
+    address = ":".join(f"{byte:02X}" for byte in index.to_bytes(6, "big"))
+    return SimulatedFlower(SimulatorConfig(**settings), address=address)
+
+
+async def _connected(flower: SimulatedFlower) -> FlowerLightDevice:
+    """Return a device connected to a simulated flower."""
+    device = FlowerLightDevice(flower.ble_device, connector=flower.connect)
+    if not await device.connect():
+        raise RuntimeError(f"Could not connect to {flower.ble_device.address}")
+    return device
+
+
+def bench_encoding() -> dict[str, float]:
+    """Measure command packet encoding, reused encoder and one-off."""
+    encoder = protocol.PacketEncoder()
+    cmd = const.CMD_WRITE_STATE
+    return {
+        "encode_state_us": _per_call_us(
+            lambda: encoder.encode(cmd, 1, STATE_PAYLOAD), 20000
+        ),
+        "encode_state_oneoff_us": _per_call_us(
+            lambda: protocol.encode_packet(cmd, 1, STATE_PAYLOAD), 20000
+        ),
+        "encode_ack_us": _per_call_us(lambda: encoder.encode(cmd, 1, {}), 20000),
+    }
+
+
+async def bench_notifications() -> dict[str, float]:
+    """Measure handling of a CHAR_STATE notification."""
+    device = await _connected(_flower(**{key: 0.0 for key in LINK}))
+    frames = [
+        bytearray(protocol.STATE_DATA.pack(level % 101, level % 256, 64, 0))
+        for level in range(256)
+    ]
+    index = 0
+
+    def handle() -> None:
+        nonlocal index
+        device._notification_handler(None, frames[index & 0xFF])
+        index += 1
+
+    result = {"notify_state_us": _per_call_us(handle, 5000)}
+    await device.disconnect()
+    return result
+
+
+async def bench_service_call(samples: int = 60) -> dict[str, float]:
+    """Measure the time from a turn_on call until the flower gets the packet."""
+    flower = _flower()
+    device = await _connected(flower)
+    received: list[float] = []
+    handle_packet = flower.handle_packet
+
+    def record(data: bytes) -> None:
+        received.append(time.perf_counter())
+        handle_packet(data)
+
+    flower.handle_packet = record
+    latencies = []
+    for i in range(samples):
+        received.clear()
+        started = time.perf_counter()
+        # A new color every call, unchanged state would not be sent at all
+        await device.turn_on(rgb=(255, i * 37 % 256, 0), brightness=100, transition=0)
+        latencies.append(received[-1] - started)
+    await device.disconnect()
+    return {
+        "service_call_p50_ms": statistics.median(latencies) * 1000,
+        "service_call_p95_ms": _percentile(latencies, 95) * 1000,
+    }
+
+
+async def bench_streaming(frames: int = 80) -> dict[str, float]:
+    """Measure petal frame throughput, acknowledged and streamed writes."""
+    flower = _flower(write_without_response=True)
+    device = await _connected(flower)
+    results = {}
+    for mode, streaming in (("acked", False), ("streamed", True)):
+        device.set_streaming(streaming)
+        started = time.perf_counter()
+        for i in range(frames):
+            # Alternate levels, an unchanged level would not be sent at all
+            await device.set_petal_position(20 + i % 2 * 60, transition=0)
+        results[f"frame_{mode}_ms"] = (time.perf_counter() - started) / frames * 1000
+    await device.disconnect()
+    return results
+
+
+async def bench_connect(samples: int = 10) -> dict[str, float]:
+    """Measure connect() from the connection attempt to a ready device."""
+    durations = []
+    for i in range(samples):
+        flower = _flower(i)
+        device = FlowerLightDevice(flower.ble_device, connector=flower.connect)
+        started = time.perf_counter()
+        if not await device.connect():
+            raise RuntimeError("Connect to the simulated flower failed")
+        durations.append(time.perf_counter() - started)
+        await device.disconnect()
+    return {
+        "connect_p50_ms": statistics.median(durations) * 1000,
+        "connect_max_ms": max(durations) * 1000,
+    }
+
+
+async def bench_fleet(rounds: int = 5) -> dict[str, float]:
+    """Measure a fleet-wide turn_on at each fleet size."""
+    results = {}
+    for size in FLEET_SIZES:
+        fleet = FlowerFleet()
+        devices = await asyncio.gather(*(_connected(_flower(i)) for i in range(size)))
+        for device in devices:
+            fleet.add(device)
+        durations, skews = [], []
+        for i in range(rounds):
+            color = (255, 40 * i, 0)
+            result = await fleet.async_broadcast(
+                lambda device, color=color: device.turn_on(rgb=color, transition=0)
+            )
+            if result.failed:
+                raise RuntimeError(f"{len(result.failed)} fleet commands failed")
+            durations.append(result.duration)
+            skews.append(result.skew)
+        results[f"fleet_{size}_p50_ms"] = statistics.median(durations) * 1000
+        results[f"fleet_{size}_skew_ms"] = statistics.median(skews) * 1000
+        await asyncio.gather(*(device.disconnect() for device in devices))
+    return results
+
+
+BENCHMARKS: dict[str, Callable[[], dict[str, float] | Awaitable[dict[str, float]]]] = {
+    "encoding": bench_encoding,
+    "notifications": bench_notifications,
+    "service_call": bench_service_call,
+    "streaming": bench_streaming,
+    "connect": bench_connect,
+    "fleet": bench_fleet,
+}
+
+
+async def run(names: list[str]) -> dict[str, float]:
+    """Run benchmarks and return their metrics."""
+    metrics: dict[str, float] = {}
+    for name in names:
+        result = BENCHMARKS[name]()
+        if asyncio.iscoroutine(result):
+            result = await result
+        metrics.update(result)
+    return metrics
+
+
+def compare(
+    metrics: dict[str, float], baselines: dict[str, float], tolerance: float
+) -> list[str]:
+    """Print metrics next to their baselines and return the regressions."""
+    regressions = []
+    for key, value in metrics.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            print(f"{key:28} {value:12.3f}  (no baseline)")
+            continue
+        change = (value - baseline) / baseline if baseline else 0.0
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(key)
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{key:28} {value:12.3f}  baseline {baseline:10.3f}  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "benchmarks", nargs="*", help=f"benchmarks to run: {', '.join(BENCHMARKS)}"
+    )
+    parser.add_argument("--save", action="store_true", help="store results as baselines")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed slowdown against the baseline (default 0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+    if unknown := set(args.benchmarks) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    logging.basicConfig(level=logging.WARNING)
+    # Connect and disconnect messages of hundreds of simulated flowers
+    logging.getLogger(_PACKAGE).setLevel(logging.ERROR)
+
+    metrics = asyncio.run(run(args.benchmarks or list(BENCHMARKS)))
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    regressions = compare(metrics, baselines, args.tolerance)
+
+    if args.save:
+        baselines.update({key: round(value, 3) for key, value in metrics.items()})
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Saved {len(metrics)} baselines to {BASELINES}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} metrics regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
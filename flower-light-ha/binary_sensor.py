@@ -0,0 +1,61 @@
+"""Binary sensor platform for Flower Light integration."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .device import FlowerLightDevice
+from .events import DeviceEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Flower Light binary sensor entities."""
+    device: FlowerLightDevice = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities([FlowerChargingSensor(device, entry)])
+
+
+class FlowerChargingSensor(BinarySensorEntity):
+    """Charging sensor for Flower Light."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Charging"
+    _attr_device_class = BinarySensorDeviceClass.BATTERY_CHARGING
+    _attr_should_poll = False
+
+    def __init__(self, device: FlowerLightDevice, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._device = device
+        self._attr_unique_id = f"{entry.unique_id}_charging"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.unique_id)},
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to battery and connection changes of the device."""
+        for event in (DeviceEvent.BATTERY, DeviceEvent.CONNECTION):
+            self.async_on_remove(self._device.subscribe(event, self.async_write_ha_state))
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return if the battery is charging."""
+        return self._device.charging
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self._device.available
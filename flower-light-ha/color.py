@@ -0,0 +1,64 @@
+"""Brightness and color conversion for Flower Light."""
+from __future__ import annotations
+
+# Gamma of the brightness curve, so equal brightness steps look equally large
+BRIGHTNESS_GAMMA = 2.2
+
+
+def _build_scale_tables() -> tuple[bytes, ...]:
+    """Build one channel lookup table per brightness percent."""
+    tables = []
+    for percent in range(101):
+        factor = (percent / 100) ** BRIGHTNESS_GAMMA
+        # A lit channel stays lit at any brightness above 0
+        tables.append(
+            bytes(
+                max(1, round(channel * factor)) if channel and percent else 0
+                for channel in range(256)
+            )
+        )
+    return tuple(tables)
+
+
+# SCALE_TABLES[percent][channel]: channel value (0-255) with brightness applied
+SCALE_TABLES = _build_scale_tables()
+
+# PEAK_TO_BRIGHTNESS[peak]: brightness percent scaling a full channel to peak
+PEAK_TO_BRIGHTNESS = bytes(
+    min(range(101), key=lambda percent: (abs(SCALE_TABLES[percent][255] - peak), percent))
+    for peak in range(256)
+)
+
+# Home Assistant brightness (0-255) <-> device brightness (0-100), rounded to
+# the nearest step. Device -> HA -> device always returns the same value.
+HA_TO_DEVICE_BRIGHTNESS = bytes(round(value * 100 / 255) for value in range(256))
+DEVICE_TO_HA_BRIGHTNESS = bytes(round(percent * 255 / 100) for percent in range(101))
+
+
+def scale_color(rgb: tuple[int, int, int], brightness: int) -> tuple[int, int, int]:
+    """Return a full-scale color with a brightness (0-100) applied."""
+    table = SCALE_TABLES[brightness]
+    r, g, b = rgb
+    return table[r], table[g], table[b]
+
+
+def split_color(r: int, g: int, b: int) -> tuple[tuple[int, int, int], int]:
+    """Split a color as shown by the device into full-scale color and brightness."""
+    peak = max(r, g, b)
+    return tuple(round(c * 255 / peak) for c in (r, g, b)), PEAK_TO_BRIGHTNESS[peak]
+
+
+def to_device_brightness(value: int) -> int:
+    """Convert Home Assistant brightness (0-255) to device brightness (0-100)."""
+    return HA_TO_DEVICE_BRIGHTNESS[value]
+
+
+def to_ha_brightness(percent: int, requested: int | None = None) -> int:
+    """Convert device brightness (0-100) to Home Assistant brightness (0-255).
+
+    ``requested`` is the brightness last set from Home Assistant; it is
+    returned while the device still shows it, so the value reads back as set.
+    """
+    if requested is not None and HA_TO_DEVICE_BRIGHTNESS[requested] == percent:
+        return requested
+    return DEVICE_TO_HA_BRIGHTNESS[percent]
@@ -0,0 +1,202 @@
+"""Outbound command queue for Flower Light devices."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from .const import CMD_WRITE_PETALS, CMD_WRITE_RGB_COLOR, CMD_WRITE_STATE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Commands that only carry the target state of the flower. A newer command of
+# these types supersedes an older pending one, so they can be merged.
+COALESCABLE_COMMANDS = {CMD_WRITE_PETALS, CMD_WRITE_RGB_COLOR, CMD_WRITE_STATE}
+
+_COLOR_KEYS = ("r", "g", "b")
+
+# Per-channel difference the firmware's HSB rounding may introduce
+COLOR_TOLERANCE = 2
+
+
+@dataclass
+class _PendingCommand:
+    """Command waiting to be written to the device."""
+
+    cmd_type: int
+    payload: dict[str, Any]
+    waiters: list[asyncio.Future] = field(default_factory=list)
+
+
+def _merge_type(payload: dict[str, Any]) -> int:
+    """Return the smallest command type able to carry the merged payload."""
+    has_level = "l" in payload
+    has_color = any(key in payload for key in _COLOR_KEYS)
+    if has_level and not has_color:
+        return CMD_WRITE_PETALS
+    if has_color and not has_level:
+        return CMD_WRITE_RGB_COLOR
+    return CMD_WRITE_STATE
+
+
+class CommandQueue:
+    """Per-device queue that collapses pending state commands.
+
+    Only one command is written at a time. While a write is in progress, new
+    petal/color/state commands are merged into the last pending command
+    (latest value wins), and a pending color plus petal update collapses into a
+    single CMD_WRITE_STATE. Other commands act as barriers and keep their order.
+    """
+
+    def __init__(self, write: Callable[[int, dict[str, Any]], Awaitable[Any]]) -> None:
+        """Initialize the queue with the coroutine that writes one command."""
+        self._write = write
+        self._pending: list[_PendingCommand] = []
+        self._task: asyncio.Task | None = None
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of commands waiting to be written."""
+        return len(self._pending)
+
+    async def submit(self, cmd_type: int, payload: dict[str, Any]) -> Any:
+        """Queue a command and wait until it (or a merged command) is written."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+
+        last = self._pending[-1] if self._pending else None
+        if (
+            last is not None
+            and cmd_type in COALESCABLE_COMMANDS
+            and last.cmd_type in COALESCABLE_COMMANDS
+        ):
+            last.payload = {**last.payload, **payload}
+            last.cmd_type = _merge_type(last.payload)
+            last.waiters.append(waiter)
+            self.coalesced += 1
+            _LOGGER.debug(
+                "Coalesced command type=%s into pending type=%s", cmd_type, last.cmd_type
+            )
+        else:
+            self._pending.append(_PendingCommand(cmd_type, dict(payload), [waiter]))
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._drain())
+
+        return await waiter
+
+    async def _drain(self) -> None:
+        """Write pending commands one by one."""
+        while self._pending:
+            command = self._pending.pop(0)
+            try:
+                result = await self._write(command.cmd_type, command.payload)
+            except asyncio.CancelledError:
+                self._fail(command, asyncio.CancelledError())
+                raise
+            except Exception as err:  # noqa: BLE001 - propagated to the callers
+                self._fail(command, err)
+            else:
+                for waiter in command.waiters:
+                    if not waiter.done():
+                        waiter.set_result(result)
+
+    @staticmethod
+    def _fail(command: _PendingCommand, err: BaseException) -> None:
+        """Propagate a write failure to everyone waiting on the command."""
+        for waiter in command.waiters:
+            if not waiter.done():
+                waiter.set_exception(err)
+
+    def clear(self, err: BaseException) -> None:
+        """Drop all pending commands, failing their waiters with ``err``."""
+        pending, self._pending = self._pending, []
+        for command in pending:
+            self._fail(command, err)
+
+
+class StateDiff:
+    """Drop state commands that would not change what the flower shows.
+
+    Commands are compared with the last confirmed device state: values
+    reported on CHAR_STATE, or values of a state command that was written
+    successfully. A command matching it exactly is dropped; a CMD_WRITE_STATE
+    changing only the petals or only the color is reduced to those fields.
+    Commands are sent unchanged while the state is unknown.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the filter."""
+        self._level: int | None = None
+        self._color: tuple[int, int, int] | None = None
+        self.suppressed = 0
+        self.reduced = 0
+
+    def reset(self) -> None:
+        """Forget the confirmed state, for example while an animation runs."""
+        self._level = None
+        self._color = None
+
+    def confirm(self, payload: dict[str, Any]) -> None:
+        """Record state fields the device is known to show."""
+        if "l" in payload:
+            self._level = payload["l"]
+        if all(key in payload for key in _COLOR_KEYS):
+            self._color = tuple(payload[key] for key in _COLOR_KEYS)
+
+    def confirm_reported(self, payload: dict[str, Any]) -> None:
+        """Record state fields reported by the device.
+
+        The firmware converts colors through HSB, so a reported color within
+        COLOR_TOLERANCE of the confirmed one is that color rounded; the
+        confirmed value is kept so sending it again is still dropped.
+        """
+        if "l" in payload:
+            self._level = payload["l"]
+        color = (payload["r"], payload["g"], payload["b"])
+        confirmed = self._color
+        if (
+            confirmed is None
+            or abs(color[0] - confirmed[0]) > COLOR_TOLERANCE
+            or abs(color[1] - confirmed[1]) > COLOR_TOLERANCE
+            or abs(color[2] - confirmed[2]) > COLOR_TOLERANCE
+        ):
+            self._color = color
+
+    def filter(
+        self, cmd_type: int, payload: dict[str, Any]
+    ) -> tuple[int, dict[str, Any]] | None:
+        """Return the command reduced to changed fields, None if nothing changes."""
+        has_level = "l" in payload
+        has_color = all(key in payload for key in _COLOR_KEYS)
+        if (
+            cmd_type not in COALESCABLE_COMMANDS
+            or not (has_level or has_color)
+            or (not has_color and any(key in payload for key in _COLOR_KEYS))
+        ):
+            # Not a state command, no state (the pairing acknowledgment) or a
+            # partial color, which is left to the firmware
+            return cmd_type, payload
+
+        level_changed = has_level and payload["l"] != self._level
+        color_changed = (
+            has_color and tuple(payload[key] for key in _COLOR_KEYS) != self._color
+        )
+        if not level_changed and not color_changed:
+            self.suppressed += 1
+            _LOGGER.debug("Dropped command type=%s, state unchanged", cmd_type)
+            return None
+        if level_changed == has_level and color_changed == has_color:
+            return cmd_type, payload
+
+        reduced = {
+            key: value
+            for key, value in payload.items()
+            if (key == "l" and level_changed)
+            or (key in _COLOR_KEYS and color_changed)
+            or key not in ("l", *_COLOR_KEYS)
+        }
+        self.reduced += 1
+        return _merge_type(reduced), reduced
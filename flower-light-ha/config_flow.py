@@ -1,24 +1,46 @@
 """Config flow for Flower Light integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
-from bleak import BleakScanner
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothScanningMode,
     BluetoothServiceInfoBleak,
     async_discovered_service_info,
+    async_process_advertisements,
 )
 from homeassistant.const import CONF_ADDRESS, CONF_NAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-
-from .const import DOMAIN, SERVICE_COMMAND
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CONF_EXPECTED_COUNT,
+    CONF_IDLE_TIMEOUT,
+    CONF_STATE_WRITE_RATE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_STATE_WRITE_RATE,
+    DISCOVERY_SCAN_TIMEOUT,
+    DOMAIN,
+    SERVICE_COMMAND,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Service UUIDs advertised by flowers; bleak reports UUIDs in lowercase
+FLOWER_SERVICE_UUIDS = frozenset({SERVICE_COMMAND.lower()})
+
+
+def _is_flower(service_info: BluetoothServiceInfoBleak) -> bool:
+    """Return if an advertisement comes from a Flower Light."""
+    return not FLOWER_SERVICE_UUIDS.isdisjoint(service_info.service_uuids)
+
 
 class FlowerLightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Flower Light."""
@@ -29,6 +51,14 @@ class FlowerLightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._discovered_devices: dict[str, BluetoothServiceInfoBleak] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> FlowerLightOptionsFlow:
+        """Get the options flow for this handler."""
+        return FlowerLightOptionsFlow(config_entry)
+
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
     ) -> FlowResult:
@@ -63,49 +93,158 @@ class FlowerLightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle user-initiated setup."""
+        """Handle user-initiated setup of one or more flowers."""
         if user_input is not None:
-            address = user_input[CONF_ADDRESS]
-            await self.async_set_unique_id(address)
-            self._abort_if_unique_id_configured()
-            
-            device_info = self._discovered_devices[address]
-            
-            return self.async_create_entry(
-                title=device_info.name or address,
-                data={
-                    CONF_ADDRESS: address,
-                    CONF_NAME: device_info.name,
-                },
-            )
+            return await self._async_create_entries(user_input[CONF_ADDRESS])
 
-        # Discover nearby Flower Light devices
+        # Flowers the Bluetooth integration has already seen advertising
         current_addresses = self._async_current_ids()
-        
-        # Use Home Assistant's Bluetooth integration to find devices
         for discovery_info in async_discovered_service_info(self.hass):
-            if discovery_info.address in current_addresses:
-                continue
-            # Check if device advertises the Flower Light service
-            if SERVICE_COMMAND.lower() in [
-                s.lower() for s in discovery_info.service_uuids
-            ]:
+            if discovery_info.address not in current_addresses and _is_flower(
+                discovery_info
+            ):
                 self._discovered_devices[discovery_info.address] = discovery_info
 
+        if not self._discovered_devices:
+            return await self.async_step_scan()
+        return self._async_show_devices()
+
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan actively for flowers that were not discovered passively."""
+        if user_input is None:
+            return self.async_show_form(
+                step_id="scan",
+                data_schema=vol.Schema(
+                    {
+                        vol.Required(CONF_EXPECTED_COUNT, default=1): vol.All(
+                            vol.Coerce(int), vol.Range(min=1, max=100)
+                        ),
+                    }
+                ),
+                description_placeholders={"timeout": str(int(DISCOVERY_SCAN_TIMEOUT))},
+            )
+
+        expected = user_input[CONF_EXPECTED_COUNT]
+        current_addresses = self._async_current_ids()
+
+        @callback
+        def _found(service_info: BluetoothServiceInfoBleak) -> bool:
+            """Collect flowers, stop once the expected number was found."""
+            if service_info.address not in current_addresses and _is_flower(service_info):
+                self._discovered_devices[service_info.address] = service_info
+            return len(self._discovered_devices) >= expected
+
+        try:
+            await async_process_advertisements(
+                self.hass,
+                _found,
+                BluetoothCallbackMatcher(
+                    service_uuid=SERVICE_COMMAND.lower(), connectable=True
+                ),
+                BluetoothScanningMode.ACTIVE,
+                DISCOVERY_SCAN_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.debug(
+                "Scan found %s of %s flowers", len(self._discovered_devices), expected
+            )
+
         if not self._discovered_devices:
             return self.async_abort(reason="no_devices_found")
+        return self._async_show_devices()
 
-        # Create list for user selection
+    @callback
+    def _async_show_devices(self) -> FlowResult:
+        """Show the discovered flowers for selection, all selected."""
         devices = {
             address: f"{info.name or 'Unknown'} ({address})"
             for address, info in self._discovered_devices.items()
         }
-
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_ADDRESS): vol.In(devices),
+                    vol.Required(CONF_ADDRESS, default=list(devices)): vol.All(
+                        cv.multi_select(devices), vol.Length(min=1)
+                    ),
+                }
+            ),
+            description_placeholders={"count": str(len(devices))},
+        )
+
+    async def _async_create_entries(self, addresses: list[str]) -> FlowResult:
+        """Create an entry for every selected flower.
+
+        This flow creates the entry of the first flower; each other flower
+        gets its own integration discovery flow, which creates its entry
+        without asking again.
+        """
+        first, *others = addresses
+        for address in others:
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                    data=self._entry_data(address),
+                )
+            )
+
+        await self.async_set_unique_id(first, raise_on_progress=False)
+        self._abort_if_unique_id_configured()
+        data = self._entry_data(first)
+        return self.async_create_entry(title=data[CONF_NAME] or first, data=data)
+
+    def _entry_data(self, address: str) -> dict[str, Any]:
+        """Return the entry data of a discovered flower."""
+        return {
+            CONF_ADDRESS: address,
+            CONF_NAME: self._discovered_devices[address].name,
+        }
+
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> FlowResult:
+        """Add a flower selected together with others in the user step."""
+        address = discovery_info[CONF_ADDRESS]
+        await self.async_set_unique_id(address, raise_on_progress=False)
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=discovery_info[CONF_NAME] or address,
+            data=discovery_info,
+        )
+
+
+class FlowerLightOptionsFlow(config_entries.OptionsFlow):
+    """Handle Flower Light options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_IDLE_TIMEOUT,
+                        default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                    vol.Optional(
+                        CONF_STATE_WRITE_RATE,
+                        default=options.get(
+                            CONF_STATE_WRITE_RATE, DEFAULT_STATE_WRITE_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
                 }
             ),
         )
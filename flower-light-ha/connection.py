@@ -0,0 +1,205 @@
+"""Connection management for Flower Light devices."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import logging
+from typing import TYPE_CHECKING
+
+from bleak.exc import BleakError
+
+from .const import (
+    CONNECT_RETRY_DELAY,
+    CONNECT_RETRY_MAX_DELAY,
+    DEFAULT_CONNECT_CONCURRENCY,
+    DEFAULT_MAX_CONNECTIONS,
+)
+
+if TYPE_CHECKING:
+    from .device import FlowerLightDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionManager:
+    """Share the adapter's connection slots between Flower Light devices.
+
+    Devices connect in the background after setup, or lazily when a command
+    arrives. At most ``connect_concurrency`` connection attempts run at once.
+    A device that lost its link reconnects as soon as it advertises again.
+    Links that stay idle for their idle timeout are dropped, and when every
+    slot is taken the least recently used device is disconnected to make room.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        connect_concurrency: int = DEFAULT_CONNECT_CONCURRENCY,
+    ) -> None:
+        """Initialize the manager."""
+        self.max_connections = max_connections
+        self._connect_slots = asyncio.Semaphore(connect_concurrency)
+        self._devices: OrderedDict[str, FlowerLightDevice] = OrderedDict()
+        self._idle_timeouts: dict[str, float] = {}
+        self._idle_handles: dict[str, asyncio.TimerHandle] = {}
+        self._idle_tasks: dict[str, asyncio.Task] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Devices with a background connect running, woken by advertisements
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._reconnect_tasks: dict[str, asyncio.Task] = {}
+
+    def register(self, device: FlowerLightDevice, idle_timeout: float = 0) -> None:
+        """Start managing a device; an idle timeout of 0 keeps it connected."""
+        self._locks.setdefault(device.address, asyncio.Lock())
+        self._idle_timeouts[device.address] = idle_timeout
+        device.set_connection_manager(self)
+
+    def unregister(self, device: FlowerLightDevice) -> None:
+        """Stop managing a device."""
+        self._cancel_idle(device.address)
+        self._devices.pop(device.address, None)
+        self._idle_timeouts.pop(device.address, None)
+        self._locks.pop(device.address, None)
+        for tasks in (self._reconnect_tasks, self._idle_tasks):
+            if (task := tasks.pop(device.address, None)) is not None:
+                task.cancel()
+        device.set_connection_manager(None)
+
+    def set_idle_timeout(self, device: FlowerLightDevice, idle_timeout: float) -> None:
+        """Change the idle timeout of a device."""
+        self._idle_timeouts[device.address] = idle_timeout
+        if device.is_connected:
+            self.touch(device)
+
+    @property
+    def connected_count(self) -> int:
+        """Return the number of managed devices currently connected."""
+        return sum(1 for device in self._devices.values() if device.is_connected)
+
+    def touch(self, device: FlowerLightDevice) -> None:
+        """Mark a device as used and restart its idle timer."""
+        if device.address in self._devices:
+            self._devices.move_to_end(device.address)
+        self._cancel_idle(device.address)
+        idle_timeout = self._idle_timeouts.get(device.address, 0)
+        if idle_timeout > 0:
+            self._idle_handles[device.address] = asyncio.get_running_loop().call_later(
+                idle_timeout, self._handle_idle, device
+            )
+
+    async def async_acquire(self, device: FlowerLightDevice) -> None:
+        """Make sure a device is connected, reconnecting it if needed."""
+        lock = self._locks.setdefault(device.address, asyncio.Lock())
+        async with lock:
+            if device.is_connected:
+                self.touch(device)
+                return
+
+            async with self._connect_slots:
+                await self._async_make_room(device)
+                if not await device.connect():
+                    raise BleakError(f"Could not connect to {device.address}")
+
+            self._devices[device.address] = device
+            self.touch(device)
+            _LOGGER.debug(
+                "Connected %s in %.2fs (%s/%s slots used)",
+                device.address,
+                device.last_connect_duration,
+                self.connected_count,
+                self.max_connections,
+            )
+
+    async def async_connect_in_background(self, device: FlowerLightDevice) -> None:
+        """Connect a device, retrying with backoff until it succeeds.
+
+        While the device is out of range no attempts are made; the next one
+        starts when it advertises again. An advertisement also cuts the wait
+        between retries short.
+        """
+        wakeup = self._wakeups[device.address] = asyncio.Event()
+        delay = CONNECT_RETRY_DELAY
+        try:
+            while True:
+                if not device.present:
+                    wakeup.clear()
+                    await wakeup.wait()
+                    continue
+                try:
+                    await self.async_acquire(device)
+                    return
+                except Exception as err:  # noqa: BLE001 - retried until cancelled
+                    _LOGGER.debug(
+                        "Connecting %s failed, retrying in %.0fs: %s", device.address, delay, err
+                    )
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, CONNECT_RETRY_MAX_DELAY)
+        finally:
+            if self._wakeups.get(device.address) is wakeup:
+                del self._wakeups[device.address]
+
+    def device_seen(self, device: FlowerLightDevice) -> None:
+        """Reconnect a device that lost its link now that it advertises."""
+        if device.is_connected or device.idle or device.address not in self._locks:
+            return
+        if (wakeup := self._wakeups.get(device.address)) is not None:
+            # A background connect waits for the device to come back in range
+            # or for its next retry
+            wakeup.set()
+            return
+        if device.address in self._reconnect_tasks:
+            return
+        _LOGGER.debug("Reconnecting %s after it advertised", device.address)
+        task = asyncio.get_running_loop().create_task(
+            self.async_connect_in_background(device)
+        )
+        self._reconnect_tasks[device.address] = task
+        task.add_done_callback(lambda _: self._reconnect_tasks.pop(device.address, None))
+
+    async def _async_make_room(self, device: FlowerLightDevice) -> None:
+        """Disconnect least recently used devices until a slot is free.
+
+        Devices running a long transition are kept: their next segment would
+        reconnect them and evict another device in turn.
+        """
+        for address, candidate in list(self._devices.items()):
+            if self.connected_count < self.max_connections:
+                return
+            if (
+                address == device.address
+                or not candidate.is_connected
+                or candidate.transition_running
+            ):
+                continue
+            _LOGGER.debug("Evicting %s to free a connection slot", address)
+            self._cancel_idle(address)
+            await candidate.disconnect(idle=True)
+
+    def _handle_idle(self, device: FlowerLightDevice) -> None:
+        """Disconnect a device whose idle timeout expired."""
+        self._idle_handles.pop(device.address, None)
+        if not device.is_connected:
+            return
+        if device.queue_depth or device.transition_running:
+            self.touch(device)
+            return
+        _LOGGER.debug("Disconnecting idle device %s", device.address)
+        task = asyncio.get_running_loop().create_task(device.disconnect(idle=True))
+        self._idle_tasks[device.address] = task
+        task.add_done_callback(lambda done: self._idle_disconnect_done(device.address, done))
+
+    def _idle_disconnect_done(self, address: str, task: asyncio.Task) -> None:
+        """Forget a finished idle disconnect and log its failure."""
+        if self._idle_tasks.get(address) is task:
+            del self._idle_tasks[address]
+        if not task.cancelled() and (err := task.exception()) is not None:
+            _LOGGER.debug("Disconnecting idle device %s failed: %s", address, err)
+
+    def _cancel_idle(self, address: str) -> None:
+        """Cancel the idle timer of a device."""
+        if (handle := self._idle_handles.pop(address, None)) is not None:
+            handle.cancel()
@@ -2,6 +2,41 @@
 
 DOMAIN = "flower_light"
 
+# Keys in hass.data[DOMAIN] besides config entry ids
+DATA_DEVICE_INFO_CACHE = "device_info_cache"
+DATA_CONNECTION_MANAGER = "connection_manager"
+DATA_FLEET = "fleet"
+
+# Options
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_STATE_WRITE_RATE = "state_write_rate"
+
+# Config flow: flowers expected by the active scan, which stops once found
+CONF_EXPECTED_COUNT = "expected_count"
+
+# Seconds the config flow scans actively when none were discovered passively
+DISCOVERY_SCAN_TIMEOUT = 15.0
+
+# Seconds without commands before a link is dropped (0 keeps it open)
+DEFAULT_IDLE_TIMEOUT = 0
+
+# State updates written to Home Assistant per second and device (0 is unlimited)
+DEFAULT_STATE_WRITE_RATE = 4
+
+# Connections kept open at once; matches the slots of common BLE adapters
+DEFAULT_MAX_CONNECTIONS = 5
+
+# Connection attempts run at once across all flowers; adapters establish
+# links one at a time, so more only makes each attempt slower
+DEFAULT_CONNECT_CONCURRENCY = 2
+
+# Seconds between background connect attempts, doubled up to the maximum
+CONNECT_RETRY_DELAY = 5.0
+CONNECT_RETRY_MAX_DELAY = 300.0
+
+# Devices per adapter commanded at once by the fleet light
+DEFAULT_FLEET_CONCURRENCY = 5
+
 # Bluetooth Service UUIDs
 SERVICE_COMMAND = "28e17913-66c1-475f-a76e-86b5242f4cec"
 SERVICE_CONFIG = "96f75832-8ce3-4800-b528-b39225282e9e"
@@ -31,16 +66,41 @@ CHAR_FIRMWARE = "00002a26-0000-1000-8000-00805f9b34fb"
 CHAR_HARDWARE = "00002a27-0000-1000-8000-00805f9b34fb"
 CHAR_MANUFACTURER = "00002a29-0000-1000-8000-00805f9b34fb"
 
+# Response Statuses
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_UNAUTHORIZED = 2
+STATUS_UNSUPPORTED = 3
+
+# Protocol Commands (WiFi connection to the Floud server)
+PROTOCOL_AUTH = 16
+PROTOCOL_STATUS = 17
+
 # Command Types
 CMD_WRITE_PETALS = 64
 CMD_WRITE_RGB_COLOR = 65
 CMD_WRITE_STATE = 67
+CMD_READ_STATE = 68
 CMD_PLAY_ANIMATION = 69
 CMD_RUN_OTA_UPDATE = 70
 CMD_WRITE_WIFI = 71
 CMD_WRITE_NAME = 74
 CMD_WRITE_CUSTOMIZATION = 75
+CMD_READ_CUSTOMIZATION = 76
 CMD_WRITE_COLOR_SCHEME = 77
+CMD_READ_DEVICE_INFO = 79
+
+# Connection readiness probe: first retry delay, backoff cap and overall
+# limit (seconds) for the first operation after connecting
+READY_PROBE_DELAY = 0.05
+READY_PROBE_MAX_DELAY = 0.4
+READY_TIMEOUT = 3.0
+
+# Seconds to wait for the response to a read command
+RESPONSE_TIMEOUT = 2.0
+
+# Floud server the firmware connects to over WiFi (connect.floud.cz)
+FLOUD_PORT = 3000
 
 # Effect mapping (animation IDs from firmware)
 # platformio/floower/src/hardware/Floower.h:
@@ -59,7 +119,14 @@ EFFECT_TO_ANIMATION_ID = {
 
 EFFECT_LIST = ["Rainbow", "Rainbow Loop", "Candle", "Wind"]
 
+# Streaming mode: at most this many write-without-response frames are sent
+# before an acknowledged write is used to drain the link.
+STREAM_WINDOW = 8
+
 # Defaults
 DEFAULT_TRANSITION_MS = 1000
 MIN_TRANSITION_MS = 0
 MAX_TRANSITION_MS = 60000
+
+# Easing of transitions longer than MAX_TRANSITION_MS, scheduled by the host
+DEFAULT_TRANSITION_EASING = "ease_in_out"
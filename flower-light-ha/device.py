@@ -1,10 +1,13 @@
 """Flower Light BLE device communication."""
+from __future__ import annotations
+
 import asyncio
+from dataclasses import dataclass
 import logging
 import struct
-from typing import Any, Callable
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
-import msgpack
 from bleak import BleakClient
 from bleak.exc import BleakError
 from bleak_retry_connector import (
@@ -12,8 +15,11 @@ from bleak_retry_connector import (
     establish_connection,
 )
 
+from .color import scale_color, split_color
+from .command_queue import COLOR_TOLERANCE, CommandQueue, StateDiff
 from .const import (
     CHAR_BATTERY_LEVEL,
+    CHAR_BATTERY_POWER_STATE,
     CHAR_BRIGHTNESS,
     CHAR_COMMAND,
     CHAR_FIRMWARE,
@@ -25,21 +31,75 @@ from .const import (
     CHAR_SPEED,
     CHAR_STATE,
     CMD_PLAY_ANIMATION,
+    CMD_READ_CUSTOMIZATION,
+    CMD_READ_DEVICE_INFO,
     CMD_WRITE_CUSTOMIZATION,
     CMD_WRITE_PETALS,
     CMD_WRITE_RGB_COLOR,
     CMD_WRITE_STATE,
+    DEFAULT_STATE_WRITE_RATE,
+    DEFAULT_TRANSITION_EASING,
+    MAX_TRANSITION_MS,
+    READY_PROBE_DELAY,
+    READY_PROBE_MAX_DELAY,
+    READY_TIMEOUT,
+    RESPONSE_TIMEOUT,
+    STATUS_OK,
+)
+from .events import DeviceEvent, EventBus
+from .metrics import ConnectTrace, DeviceMetrics
+from .protocol import (
+    CommandResponse,
+    PacketEncoder,
+    ResponseTracker,
+    StreamWriter,
+    decode_packet,
+    decode_state,
 )
+from .transition import Keyframe, plan_transition
+
+if TYPE_CHECKING:
+    from .connection import ConnectionManager
 
 _LOGGER = logging.getLogger(__name__)
 
+# Battery Power State: charge state in bits 4-5, 0b11 while charging
+POWER_STATE_CHARGING = 3
+
+
+@dataclass
+class _Transition:
+    """Target of a host-scheduled transition, kept to resume it."""
+
+    rgb: tuple[int, int, int]
+    brightness: int
+    petal_position: int
+    turn_off: bool
+    easing: str
+    # time.monotonic() at which the transition ends
+    deadline: float
+
+
+# Commands that carry animation frames and may be streamed without response
+STREAMABLE_COMMANDS = {CMD_WRITE_PETALS, CMD_WRITE_RGB_COLOR, CMD_WRITE_STATE}
+
 
 class FlowerLightDevice:
     """Represents a Flower Light BLE device."""
 
-    def __init__(self, ble_device, name: str | None = None) -> None:
-        """Initialize the device."""
+    def __init__(
+        self,
+        ble_device,
+        name: str | None = None,
+        connector: Callable[..., Awaitable[BleakClient]] = establish_connection,
+    ) -> None:
+        """Initialize the device.
+
+        ``connector`` establishes the GATT connection; it takes the arguments
+        of bleak_retry_connector.establish_connection, which is the default.
+        """
         self._ble_device = ble_device
+        self._connector = connector
         self.address = ble_device.address
         self.name = name or ble_device.name or "Flower Light"
         self._client: BleakClientWithServiceCache | None = None
@@ -49,57 +109,159 @@ class FlowerLightDevice:
         self._rgb_color = (255, 255, 255)
         self._petal_position = 0
         self._battery_level = None
-        self._callback: Callable | None = None
+        self._charging: bool | None = None
+        self._events = EventBus()
+        self._transition: _Transition | None = None
+        self._transition_task: asyncio.Task | None = None
+        # Bumped by every command replacing a transition, so a transition still
+        # writing its first segment knows it was superseded
+        self._transition_generation = 0
+        self._transition_starting = False
+        self._events.set_rate(DeviceEvent.STATE, DEFAULT_STATE_WRITE_RATE)
         self._model = None
         self._manufacturer = None
         self._firmware = None
         self._serial = None
+        self._info_cached = False
+        self._settle_hint = 0.0
+        self._settle_time: float | None = None
+        self._connection_manager: ConnectionManager | None = None
+        self._available = False
+        self._idle = False
+        self._connecting = False
+        self._present = True
+        self._rssi: int | None = None
+        self._last_seen: float | None = None
+        self._last_connect_duration: float | None = None
+        self._connect_count = 0
+        self.metrics = DeviceMetrics()
+        self._encoder = PacketEncoder()
+        self._queue = CommandQueue(self._write_command)
+        self._state_diff = StateDiff()
+        # Without state notifications changes made on the flower itself go
+        # unnoticed, so commands are only filtered while they are enabled
+        self._state_notify_active = False
+        self._streaming = False
+        self._writer = StreamWriter()
+        self._responses_supported = False
+        self._tracker = ResponseTracker()
+
+    def restore_device_info(self, info: dict[str, Any]) -> None:
+        """Restore cached device information.
+
+        The cached values are used until the next connect reads a different
+        firmware version.
+        """
+        if not info.get("firmware"):
+            return
+        self._manufacturer = info.get("manufacturer")
+        self._model = info.get("model")
+        self._firmware = info["firmware"]
+        self._serial = info.get("serial")
+        self._info_cached = True
+
+    @property
+    def device_info_data(self) -> dict[str, str | None]:
+        """Return device information suitable for caching."""
+        return {
+            "manufacturer": self._manufacturer,
+            "model": self._model,
+            "firmware": self._firmware,
+            "serial": self._serial,
+        }
 
     async def connect(self) -> bool:
         """Connect to the device."""
+        started = time.monotonic()
+        self.metrics.connect_attempts += 1
+        trace = ConnectTrace()
+        self._connecting = True
+        try:
+            connected = await self._connect(trace)
+        finally:
+            self._connecting = False
+        trace.finish(connected)
+        self.metrics.connects.append(trace)
+        self._idle = False
+        self._available = connected
+        if not connected:
+            self.metrics.connect_failures += 1
+        else:
+            self._last_connect_duration = time.monotonic() - started
+            if self._connect_count:
+                self.metrics.reconnects += 1
+            self._connect_count += 1
+            _LOGGER.debug(
+                "Connect to %s took %.2fs", self.address, self._last_connect_duration
+            )
+        self._events.publish(DeviceEvent.CONNECTION)
+        return connected
+
+    async def _connect(self, trace: ConnectTrace) -> bool:
+        """Establish the connection and run the connect sequence."""
         try:
             _LOGGER.debug("Attempting to connect to %s (%s)", self.name, self.address)
             
             # Use bleak_retry_connector for reliable connection
-            self._client = await establish_connection(
-                BleakClientWithServiceCache,
-                self._ble_device,
-                self.name,
-                disconnected_callback=self._handle_disconnect,
-            )
+            with trace.span("establish_connection"):
+                self._client = await self._connector(
+                    BleakClientWithServiceCache,
+                    self._ble_device,
+                    self.name,
+                    disconnected_callback=self._handle_disconnect,
+                )
+            self.metrics.establish_connection.record(trace.phases["establish_connection"])
             
             _LOGGER.info("Connected to %s (%s)", self.name, self.address)
+            self._settle_time = None
+            self._writer.reset()
+            self._state_notify_active = False
+            self._state_diff.reset()
             
-            # Give device a moment to settle
-            await asyncio.sleep(0.5)
-            
-            # Start notifications for state updates (optional, don't fail if unavailable)
-            try:
-                await self._client.start_notify(CHAR_STATE, self._notification_handler)
-                _LOGGER.debug("State notifications enabled")
-            except Exception as e:
-                _LOGGER.debug("Could not enable state notifications (this is OK): %s", e)
+            # Start notifications for state updates once the device has
+            # settled (optional, don't fail if unavailable)
+            notify_started = time.monotonic()
+            settle = await self._start_state_notify()
+            trace.record("settle", settle)
+
+            # Firmware that answers commands notifies responses on the command
+            # characteristic; otherwise reads fall back to GATT characteristics.
+            self._responses_supported = await self._start_response_notify()
+
+            # Battery level and power state are pushed instead of polled
+            await self._start_battery_notify()
+            trace.record("start_notify", time.monotonic() - notify_started - settle)
 
             # Acknowledge takeover so device can exit pairing mode.
             # Empty CMD_WRITE_STATE triggers the firmware remote-control callback
             # without changing petals/color values.
             try:
-                await self._send_command(CMD_WRITE_STATE, {})
+                with trace.span("pairing_ack"):
+                    await self._send_command(CMD_WRITE_STATE, {})
                 _LOGGER.debug("Sent pairing acknowledgment command")
             except Exception as e:
                 _LOGGER.debug("Could not send pairing acknowledgment: %s", e)
             
-            # Read initial state (optional, don't fail connection)
-            try:
-                await self._read_device_info()
-            except Exception as e:
-                _LOGGER.debug("Could not read device info (this is OK): %s", e)
-            
-            try:
-                await self._read_config()
-            except Exception as e:
-                _LOGGER.debug("Could not read config (this is OK): %s", e)
-            
+            # Read initial state concurrently (optional, don't fail connection)
+            info_result, config_result, state_result = await asyncio.gather(
+                trace.timed("device_info", self._read_device_info()),
+                trace.timed("config", self._read_config()),
+                trace.timed("read_state", self._client.read_gatt_char(CHAR_STATE)),
+                return_exceptions=True,
+            )
+            if isinstance(info_result, Exception):
+                _LOGGER.debug("Could not read device info (this is OK): %s", info_result)
+            if isinstance(config_result, Exception):
+                _LOGGER.debug("Could not read config (this is OK): %s", config_result)
+            if isinstance(state_result, Exception):
+                _LOGGER.debug("Could not read state (this is OK): %s", state_result)
+            else:
+                # Applied after the config read, which also sets brightness
+                self._apply_state_data(state_result)
+
+            if not self.is_connected:
+                _LOGGER.warning("Lost connection to %s while connecting", self.address)
+                return False
             return True
             
         except asyncio.TimeoutError:
@@ -112,14 +274,87 @@ class FlowerLightDevice:
             _LOGGER.error("Unexpected error connecting to %s: %s", self.address, e, exc_info=True)
             return False
 
+    async def _start_state_notify(self) -> float:
+        """Enable state notifications as soon as the device accepts them.
+
+        Instead of a fixed settle delay, the first operation is retried with a
+        short backoff. The wait starts from the settle hint learned for the
+        firmware, and the time the device actually needed is kept in
+        settle_time. Returns the seconds spent waiting for the device.
+        """
+        if self._client.services.get_characteristic(CHAR_STATE) is None:
+            _LOGGER.debug("State characteristic not available (this is OK)")
+            return 0.0
+
+        started = time.monotonic()
+        if self._settle_hint:
+            await asyncio.sleep(self._settle_hint)
+
+        delay = READY_PROBE_DELAY
+        attempts = 0
+        while True:
+            attempts += 1
+            attempt_started = time.monotonic()
+            try:
+                await self._client.start_notify(CHAR_STATE, self._notification_handler)
+            except Exception as e:
+                if attempt_started - started + delay > READY_TIMEOUT:
+                    _LOGGER.debug("Could not enable state notifications (this is OK): %s", e)
+                    return time.monotonic() - started
+                _LOGGER.debug("Device not ready, retrying in %.2fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, READY_PROBE_MAX_DELAY)
+                continue
+            break
+
+        self._state_notify_active = True
+        waited = attempt_started - started
+        if attempts > 1:
+            self._settle_time = waited
+        elif self._settle_hint:
+            # Ready on the first try: the device may need less than the hint,
+            # report half of it so the learned value can shrink
+            self._settle_time = waited / 2
+        # Ready at once without a hint tells nothing, settle_time stays None
+        _LOGGER.debug("State notifications enabled after %.3fs settle", waited)
+        return waited
+
+    def set_settle_hint(self, seconds: float | None) -> None:
+        """Set how long to wait after connecting before the first operation."""
+        self._settle_hint = max(0.0, seconds or 0.0)
+
+    @property
+    def settle_time(self) -> float | None:
+        """Return the settle time measured on the last connect.
+
+        When the first attempt succeeded this is half the initial wait, as the
+        device may have been ready earlier; None when it was ready without
+        waiting, which tells nothing about the settle time.
+        """
+        return self._settle_time
+
     def _handle_disconnect(self, client: BleakClient) -> None:
         """Handle disconnection."""
-        _LOGGER.warning("Device %s disconnected", self.address)
-        if self._callback:
-            self._callback()
+        if self._idle:
+            _LOGGER.debug("Device %s disconnected while idle", self.address)
+        else:
+            _LOGGER.warning("Device %s disconnected", self.address)
+            self.metrics.disconnects += 1
+        self._queue.clear(BleakError("Device disconnected"))
+        self._tracker.fail_all(BleakError("Device disconnected"))
+        self._state_notify_active = False
+        self._state_diff.reset()
+        self._events.publish(DeviceEvent.CONNECTION)
+
+    async def disconnect(self, idle: bool = False) -> None:
+        """Disconnect from the device.
 
-    async def disconnect(self) -> None:
-        """Disconnect from the device."""
+        An idle disconnect keeps the device available; it reconnects on the
+        next command.
+        """
+        self._idle = idle
+        if not idle:
+            self._cancel_transition()
         if self._client and self._client.is_connected:
             try:
                 await self._client.stop_notify(CHAR_STATE)
@@ -133,41 +368,352 @@ class FlowerLightDevice:
         """Return if device is connected."""
         return self._client is not None and self._client.is_connected
 
-    def set_state_callback(self, callback: Callable) -> None:
-        """Set callback for state updates."""
-        self._callback = callback
+    @property
+    def available(self) -> bool:
+        """Return if the device is connected or can reconnect on demand."""
+        if self.is_connected:
+            return True
+        return self._present and self._idle and self._available
+
+    @property
+    def idle(self) -> bool:
+        """Return if the link was dropped on purpose, to reconnect on demand."""
+        return self._idle
+
+    @property
+    def present(self) -> bool:
+        """Return if the device is advertising within range of an adapter."""
+        return self._present
+
+    @property
+    def rssi(self) -> int | None:
+        """Return the signal strength of the last advertisement."""
+        return self._rssi
+
+    @property
+    def last_seen(self) -> float | None:
+        """Return the time (epoch seconds) of the last advertisement."""
+        return self._last_seen
+
+    def update_from_advertisement(self, ble_device, rssi: int | None) -> None:
+        """Record an advertisement of the device.
+
+        ``ble_device`` replaces the one used for connecting, so the next
+        connect goes through the adapter or proxy that heard the device last.
+        Pass None for advertisements seen by scanners that can't connect.
+        """
+        if ble_device is not None:
+            self._ble_device = ble_device
+        self._rssi = rssi
+        self._last_seen = time.time()
+        if not self._present:
+            _LOGGER.debug("Device %s is advertising again", self.address)
+            self._present = True
+            self._events.publish(DeviceEvent.CONNECTION)
+
+    def set_away(self) -> None:
+        """Mark the device as out of range after its advertisements stopped."""
+        if not self._present or self.is_connected:
+            # A connected device may stop advertising, its link tells presence
+            return
+        _LOGGER.debug("Device %s stopped advertising", self.address)
+        self._present = False
+        self._events.publish(DeviceEvent.CONNECTION)
+
+    @property
+    def adapter(self) -> str | None:
+        """Return the adapter or proxy the device was seen through."""
+        details = getattr(self._ble_device, "details", None)
+        if isinstance(details, dict):
+            return details.get("source")
+        return None
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of commands waiting to be written."""
+        return self._queue.depth
+
+    @property
+    def last_connect_duration(self) -> float | None:
+        """Return how long the last successful connect took, in seconds."""
+        return self._last_connect_duration
+
+    @property
+    def connect_count(self) -> int:
+        """Return the number of successful connects."""
+        return self._connect_count
+
+    def set_connection_manager(self, manager: ConnectionManager | None) -> None:
+        """Set the manager used to reconnect on demand."""
+        self._connection_manager = manager
+
+    async def _ensure_connected(self) -> None:
+        """Make sure the device is connected before sending a command."""
+        if self.is_connected:
+            if self._connection_manager is not None:
+                self._connection_manager.touch(self)
+            return
+        if self._connection_manager is None or self._connecting:
+            # Commands of the connect sequence must not reconnect: the
+            # manager is already connecting this device and holds its lock
+            raise BleakError("Device not connected")
+        if not self._present:
+            # Don't wait for a connect that can't succeed
+            raise BleakError(f"Device {self.address} is out of range")
+        await self._connection_manager.async_acquire(self)
+
+    @property
+    def streaming(self) -> bool:
+        """Return if streaming mode is enabled."""
+        return self._streaming
+
+    def set_streaming(self, enabled: bool) -> None:
+        """Enable or disable streaming mode for high-rate frames.
+
+        In streaming mode petal/color/state frames are sent as
+        write-without-response, with at most STREAM_WINDOW frames in flight
+        before an acknowledged write drains the link. Configuration commands
+        always use acknowledged writes.
+
+        Long transitions don't enable it: their segments are seconds apart, so
+        the write round trip doesn't limit them, while a lost segment would
+        leave a stale fade running for up to MAX_TRANSITION_MS.
+        """
+        self._streaming = enabled
+
+    async def _start_response_notify(self) -> bool:
+        """Subscribe to command responses if the device provides them."""
+        try:
+            char = self._client.services.get_characteristic(CHAR_COMMAND)
+            if char is None or not {"notify", "indicate"} & set(char.properties):
+                return False
+            await self._client.start_notify(CHAR_COMMAND, self._response_handler)
+        except Exception as e:
+            _LOGGER.debug("Could not enable command responses: %s", e)
+            return False
+        _LOGGER.debug("Command responses enabled")
+        return True
+
+    def _response_handler(self, sender, data: bytearray) -> None:
+        """Resolve the outstanding command matching a response packet."""
+        self.metrics.notifications.record()
+        try:
+            status, message_id, payload = decode_packet(data)
+        except Exception as e:
+            _LOGGER.debug("Invalid response packet %s: %s", data.hex(), e)
+            return
+        if not self._tracker.resolve(message_id, CommandResponse(status, payload)):
+            _LOGGER.debug("Unexpected response id=%s status=%s", message_id, status)
+
+    async def _start_battery_notify(self) -> None:
+        """Read the battery characteristics and subscribe to their changes."""
+        for char_uuid, handler in (
+            (CHAR_BATTERY_LEVEL, self._battery_level_handler),
+            (CHAR_BATTERY_POWER_STATE, self._power_state_handler),
+        ):
+            if self._client.services.get_characteristic(char_uuid) is None:
+                _LOGGER.debug("Battery characteristic %s not available", char_uuid)
+                continue
+            try:
+                handler(None, await self._client.read_gatt_char(char_uuid))
+                await self._client.start_notify(char_uuid, handler)
+            except Exception as e:
+                _LOGGER.debug("Could not enable battery notifications: %s", e)
+
+    def _battery_level_handler(self, sender, data: bytearray) -> None:
+        """Handle battery level notifications."""
+        self.metrics.notifications.record()
+        if len(data) > 0 and data[0] != self._battery_level:
+            self._battery_level = data[0]
+            self._events.publish(DeviceEvent.BATTERY)
+
+    def _power_state_handler(self, sender, data: bytearray) -> None:
+        """Handle battery power state notifications."""
+        self.metrics.notifications.record()
+        if len(data) == 0:
+            return
+        charging = (data[0] >> 4) & 0b11 == POWER_STATE_CHARGING
+        if charging != self._charging:
+            self._charging = charging
+            self._events.publish(DeviceEvent.BATTERY)
+
+    def subscribe(
+        self, event: DeviceEvent, listener: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Subscribe to a device event, return a function unsubscribing again."""
+        return self._events.subscribe(event, listener)
+
+    def set_state_write_rate(self, rate: float) -> None:
+        """Limit state updates to ``rate`` per second, the last one always delivered."""
+        self._events.set_rate(DeviceEvent.STATE, rate)
+
+    @property
+    def suppressed_commands(self) -> int:
+        """Return how many state commands were dropped as unchanged."""
+        return self._state_diff.suppressed
+
+    @property
+    def reduced_commands(self) -> int:
+        """Return how many state commands were reduced to changed fields."""
+        return self._state_diff.reduced
+
+    @property
+    def suppressed_state_writes(self) -> int:
+        """Return how many state updates were merged by the rate limit."""
+        return self._events.suppressed(DeviceEvent.STATE)
 
     def _notification_handler(self, sender, data: bytearray) -> None:
-        """Handle notifications from the device."""
-        _LOGGER.debug("Received notification: %s", data.hex())
-        # Parse state updates here if needed
-        # The JS code suggests device sends state updates via this characteristic
-        if self._callback:
-            self._callback()
+        """Handle state notifications from the device."""
+        self.metrics.notifications.record()
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Received notification: %s", data.hex())
+        if self._apply_state_data(data):
+            self._events.publish(DeviceEvent.STATE)
+
+    def _apply_state_data(self, data: bytes | bytearray) -> bool:
+        """Update the known state from StatePacketData, return if it changed."""
+        try:
+            level, r, g, b = decode_state(data)
+        except struct.error as e:
+            _LOGGER.debug("Invalid state data %s: %s", data.hex(), e)
+            return False
+
+        reported = {"r": r, "g": g, "b": b}
+        if 0 <= level <= 100:
+            reported["l"] = level
+        self._state_diff.confirm_reported(reported)
+
+        changed = False
+        if 0 <= level <= 100 and level != self._petal_position:
+            self._petal_position = level
+            changed = True
+
+        if not (r or g or b):
+            if self._is_on:
+                self._is_on = False
+                changed = True
+            return changed
+
+        if not self._is_on:
+            self._is_on = True
+            changed = True
+
+        # The firmware converts colors through HSB, so the reported color may
+        # differ from the one we sent by a rounding step.
+        expected = self._scaled_color()
+        if all(
+            abs(reported - sent) <= COLOR_TOLERANCE
+            for reported, sent in zip((r, g, b), expected)
+        ):
+            return changed
+
+        # Split the reported color into a full-scale color and brightness
+        self._rgb_color, self._brightness = split_color(r, g, b)
+        return True
+
+    def _scaled_color(self) -> tuple[int, int, int]:
+        """Return the color with brightness applied, as sent to the device."""
+        return scale_color(self._rgb_color, self._brightness)
+
+    async def send(
+        self,
+        cmd_type: int,
+        payload: dict[str, Any] | None = None,
+        timeout: float = RESPONSE_TIMEOUT,
+    ) -> CommandResponse:
+        """Send a command and return the decoded response of the device.
+
+        Several commands may be outstanding at once; each response is matched
+        by its message id. Devices that don't answer commands only acknowledge
+        the write, which is reported as STATUS_OK.
+
+        Raises asyncio.TimeoutError if the response does not arrive in time.
+        """
+        await self._ensure_connected()
+
+        response = await self._queue.submit(cmd_type, payload or {})
+        if response is None:
+            return CommandResponse(STATUS_OK)
+        try:
+            return await asyncio.wait_for(response, timeout)
+        except asyncio.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
 
     async def _send_command(self, cmd_type: int, payload: dict[str, Any]) -> None:
-        """Send a command to the device."""
+        """Send a command to the device through the coalescing queue."""
+        await self._ensure_connected()
+
+        response = await self._queue.submit(cmd_type, payload)
+        if response is not None:
+            response.add_done_callback(
+                lambda done, cmd_type=cmd_type: self._log_response(cmd_type, done)
+            )
+
+    @staticmethod
+    def _log_response(cmd_type: int, done: asyncio.Future) -> None:
+        """Log the response of a command nobody waits for."""
+        if done.cancelled():
+            return
+        if (err := done.exception()) is not None:
+            _LOGGER.debug("No response to command type=%s: %s", cmd_type, err)
+        elif not done.result().ok:
+            _LOGGER.debug("Command type=%s failed with status %s", cmd_type, done.result().status)
+
+    async def _write_command(
+        self, cmd_type: int, payload: dict[str, Any]
+    ) -> asyncio.Future[CommandResponse] | None:
+        """Encode a command and write it to the device.
+
+        Returns the future of the response when the device answers commands.
+        """
         if not self.is_connected:
             raise BleakError("Device not connected")
 
-        # Firmware expects: [type(2B)][id(2B)][payload_len(2B)] + msgpack payload
-        payload_bytes = msgpack.packb(payload or {}, use_bin_type=True)
-        if len(payload_bytes) > 255:
-            raise ValueError(f"Command payload too large: {len(payload_bytes)} bytes")
+        if self._state_notify_active:
+            if (command := self._state_diff.filter(cmd_type, payload)) is None:
+                return None
+            cmd_type, payload = command
 
         message_id = self._message_id & 0xFFFF
-        packet = struct.pack(">HHH", cmd_type, message_id, len(payload_bytes)) + payload_bytes
+        packet = self._encoder.encode(cmd_type, message_id, payload)
         self._message_id = (message_id + 1) & 0xFFFF
 
-        _LOGGER.debug(
-            "Sending command type=%s id=%s payload=%s packet=%s",
-            cmd_type,
-            message_id,
-            payload,
-            packet.hex(),
-        )
+        response: asyncio.Future[CommandResponse] | None = None
+        if self._responses_supported:
+            # Register before writing, the response may arrive before the ack
+            response = self._tracker.expect(message_id)
 
-        await self._client.write_gatt_char(CHAR_COMMAND, packet, response=True)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Sending command type=%s id=%s payload=%s packet=%s",
+                cmd_type,
+                message_id,
+                payload,
+                packet.hex(),
+            )
+
+        self.metrics.record_queue_depth(self._queue.depth)
+        started = time.monotonic()
+        try:
+            await self._writer.write(
+                self._client,
+                packet,
+                stream=self._streaming and cmd_type in STREAMABLE_COMMANDS,
+            )
+        except BaseException as err:
+            if response is not None:
+                response.cancel()
+            if isinstance(err, Exception):
+                self.metrics.write_errors += 1
+            raise
+        self.metrics.record_command(cmd_type, time.monotonic() - started)
+        if cmd_type == CMD_PLAY_ANIMATION:
+            # The animation changes petals and color on its own
+            self._state_diff.reset()
+        elif cmd_type in STREAMABLE_COMMANDS:
+            self._state_diff.confirm(payload)
+        return response
 
     async def turn_on(
         self,
@@ -177,6 +723,11 @@ class FlowerLightDevice:
         transition: int = 1000,
     ) -> None:
         """Turn on the light."""
+        if transition > MAX_TRANSITION_MS:
+            await self.transition_to(rgb, brightness, petal_position, transition)
+            return
+
+        self._cancel_transition()
         if rgb is not None:
             self._rgb_color = rgb
         if brightness is not None:
@@ -184,13 +735,7 @@ class FlowerLightDevice:
         if petal_position is not None:
             self._petal_position = petal_position
 
-        r, g, b = self._rgb_color
-        
-        # Apply brightness to RGB values
-        brightness_factor = self._brightness / 100.0
-        r = int(r * brightness_factor)
-        g = int(g * brightness_factor)
-        b = int(b * brightness_factor)
+        r, g, b = self._scaled_color()
 
         await self._send_command(
             CMD_WRITE_STATE,
@@ -203,9 +748,15 @@ class FlowerLightDevice:
             },
         )
         self._is_on = True
+        self._events.publish(DeviceEvent.STATE)
 
     async def turn_off(self, transition: int = 1000) -> None:
         """Turn off the light."""
+        if transition > MAX_TRANSITION_MS:
+            await self.transition_to(duration=transition, turn_off=True)
+            return
+
+        self._cancel_transition()
         await self._send_command(
             CMD_WRITE_STATE,
             {
@@ -217,36 +768,184 @@ class FlowerLightDevice:
             },
         )
         self._is_on = False
+        self._events.publish(DeviceEvent.STATE)
 
     async def set_rgb_color(
         self, r: int, g: int, b: int, transition: int = 1000
     ) -> None:
         """Set RGB color."""
+        self._cancel_transition()
         self._rgb_color = (r, g, b)
-        
-        # Apply brightness
-        brightness_factor = self._brightness / 100.0
-        r = int(r * brightness_factor)
-        g = int(g * brightness_factor)
-        b = int(b * brightness_factor)
-        
+        r, g, b = self._scaled_color()
+
         await self._send_command(
             CMD_WRITE_RGB_COLOR,
             {"r": r, "g": g, "b": b, "t": transition},
         )
+        self._events.publish(DeviceEvent.STATE)
 
     async def set_petal_position(self, level: int, transition: int = 1000) -> None:
-        """Set petal opening position (0-100%)."""
+        """Set petal opening position (0-100%).
+
+        A running long transition continues afterwards with the new level.
+        """
+        interrupted = self._cancel_transition()
         self._petal_position = max(0, min(100, level))
         await self._send_command(
             CMD_WRITE_PETALS,
             {"l": self._petal_position, "t": transition},
         )
+        self._events.publish(DeviceEvent.STATE)
+        if interrupted is not None and self._transition is None:
+            interrupted.petal_position = self._petal_position
+            self._transition = interrupted
+            await self.resume_transition()
 
     async def play_animation(self, animation_id: int) -> None:
         """Play a built-in animation."""
+        self._cancel_transition()
         await self._send_command(CMD_PLAY_ANIMATION, {"a": animation_id})
 
+    async def transition_to(
+        self,
+        rgb: tuple[int, int, int] | None = None,
+        brightness: int | None = None,
+        petal_position: int | None = None,
+        duration: int = 0,
+        easing: str = DEFAULT_TRANSITION_EASING,
+        turn_off: bool = False,
+    ) -> None:
+        """Fade to a state over any duration (ms).
+
+        The firmware fades for at most MAX_TRANSITION_MS, so longer transitions
+        are split into segments along the easing curve and scheduled here. The
+        first segment is sent before returning; the rest run in the background
+        until the transition ends or another command interrupts it.
+        """
+        self._cancel_transition()
+        self._transition = _Transition(
+            rgb=rgb or self._rgb_color,
+            brightness=self._brightness if brightness is None else brightness,
+            petal_position=(
+                self._petal_position if petal_position is None else petal_position
+            ),
+            turn_off=turn_off,
+            easing=easing,
+            deadline=time.monotonic() + duration / 1000,
+        )
+        await self._start_transition(duration)
+
+    async def resume_transition(self) -> bool:
+        """Continue an interrupted transition from the current state."""
+        if self._transition is None or self.transition_running:
+            return False
+        remaining = self._transition.deadline - time.monotonic()
+        if remaining <= 0:
+            self._transition = None
+            return False
+        await self._start_transition(int(remaining * 1000))
+        return True
+
+    async def _start_transition(self, duration: int) -> None:
+        """Plan the remaining transition and start sending its segments."""
+        target = self._transition
+        r, g, b = self._scaled_color() if self._is_on else (0, 0, 0)
+        if target.turn_off:
+            end = (0, 0, 0, target.petal_position)
+        else:
+            end = (*scale_color(target.rgb, target.brightness), target.petal_position)
+        keyframes = plan_transition(
+            (r, g, b, self._petal_position), end, duration, target.easing
+        )
+        _LOGGER.debug(
+            "Transition of %.0fs on %s planned as %s segments",
+            duration / 1000,
+            self.address,
+            len(keyframes),
+        )
+
+        generation = self._transition_generation
+        started = time.monotonic()
+        self._transition_starting = True
+        try:
+            await self._send_keyframe(keyframes[0])
+        finally:
+            if generation == self._transition_generation:
+                self._transition_starting = False
+        if generation != self._transition_generation:
+            # A newer command replaced the transition during the first write
+            return
+        if len(keyframes) > 1:
+            self._transition_task = asyncio.get_running_loop().create_task(
+                self._run_transition(keyframes[1:], started)
+            )
+        else:
+            self._finish_transition()
+
+    async def _run_transition(self, keyframes: list[Keyframe], started: float) -> None:
+        """Send each segment when the previous one ends."""
+        try:
+            for keyframe in keyframes:
+                # Deadlines are relative to the start, so delays don't add up
+                start_at = started + (keyframe.end_ms - keyframe.duration_ms) / 1000
+                await asyncio.sleep(max(0.0, start_at - time.monotonic()))
+                await self._send_keyframe(keyframe)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _LOGGER.warning("Transition on %s interrupted: %s", self.address, e)
+            self._transition_task = None
+            return
+        self._transition_task = None
+        self._finish_transition()
+
+    async def _send_keyframe(self, keyframe: Keyframe) -> None:
+        """Send one segment of a transition and track it as the state."""
+        r, g, b, level = keyframe.values
+        await self._send_command(
+            CMD_WRITE_STATE,
+            {"l": level, "r": r, "g": g, "b": b, "t": keyframe.duration_ms},
+        )
+        self._petal_position = level
+        if r or g or b:
+            self._is_on = True
+            self._rgb_color, self._brightness = split_color(r, g, b)
+        self._events.publish(DeviceEvent.STATE)
+
+    def _finish_transition(self) -> None:
+        """Settle the state on the exact transition target."""
+        target, self._transition = self._transition, None
+        if target is None:
+            return
+        if target.turn_off:
+            self._is_on = False
+        else:
+            self._rgb_color = target.rgb
+            self._brightness = target.brightness
+        self._events.publish(DeviceEvent.STATE)
+
+    def _cancel_transition(self) -> _Transition | None:
+        """Stop a running transition, return it so it can be resumed.
+
+        The target is forgotten; a caller resuming it has to restore it.
+        """
+        running = self.transition_running
+        target, self._transition = self._transition, None
+        self._transition_generation += 1
+        self._transition_starting = False
+        if self._transition_task is not None:
+            self._transition_task.cancel()
+            self._transition_task = None
+        if not running:
+            return None
+        _LOGGER.debug("Transition on %s interrupted by a new command", self.address)
+        return target
+
+    @property
+    def transition_running(self) -> bool:
+        """Return if a host-scheduled transition is running."""
+        return self._transition_task is not None or self._transition_starting
+
     async def set_brightness_config(self, brightness: int) -> None:
         """Set the device's brightness configuration (0-100)."""
         await self._send_command(
@@ -256,41 +955,93 @@ class FlowerLightDevice:
             },
         )
 
+    async def _read_text(self, char_uuid: str) -> str | None:
+        """Read a string characteristic, returning None if it is unavailable."""
+        try:
+            data = await self._client.read_gatt_char(char_uuid)
+        except Exception as e:
+            _LOGGER.debug("Could not read %s: %s", char_uuid, e)
+            return None
+        return data.decode("utf-8", errors="ignore").strip("\x00")
+
+    async def _request(self, cmd_type: int, payload: dict[str, Any] | None = None) -> Any:
+        """Send a read command and return its response payload.
+
+        Returns None when the device does not answer commands.
+        """
+        if not self._responses_supported:
+            return None
+
+        try:
+            response = await self.send(cmd_type, payload)
+        except asyncio.TimeoutError:
+            _LOGGER.debug("No response to command type=%s", cmd_type)
+            return None
+        if not response.ok:
+            _LOGGER.debug("Command type=%s failed with status %s", cmd_type, response.status)
+            return None
+        return response.payload
+
     async def _read_device_info(self) -> None:
         """Read device information."""
         if not self.is_connected:
             return
 
-        # Try to read each characteristic, but don't fail if any are missing
-        try:
-            data = await self._client.read_gatt_char(CHAR_MANUFACTURER)
-            self._manufacturer = data.decode("utf-8", errors="ignore").strip("\x00")
-            _LOGGER.debug("Manufacturer: %s", self._manufacturer)
-        except Exception as e:
-            _LOGGER.debug("Could not read manufacturer: %s", e)
-            self._manufacturer = "Unknown"
+        # Cached info stays valid while the firmware version is unchanged, so
+        # only the firmware revision has to be read on reconnect.
+        if self._info_cached and not self._responses_supported:
+            firmware = await self._read_text(CHAR_FIRMWARE)
+            if firmware is not None and firmware == self._firmware:
+                _LOGGER.debug("Firmware %s unchanged, using cached device info", firmware)
+                return
+            _LOGGER.debug(
+                "Firmware changed from %s to %s, refreshing device info",
+                self._firmware,
+                firmware,
+            )
+            self._info_cached = False
 
+        # One CMD_READ_DEVICE_INFO round-trip replaces the model/firmware/serial
+        # reads when the device answers commands. Manufacturer is not part of
+        # the response, so it is read from its characteristic unless cached.
         try:
-            data = await self._client.read_gatt_char(CHAR_MODEL)
-            self._model = data.decode("utf-8", errors="ignore").strip("\x00")
-            _LOGGER.debug("Model: %s", self._model)
+            info = await self._request(CMD_READ_DEVICE_INFO)
         except Exception as e:
-            _LOGGER.debug("Could not read model: %s", e)
-            self._model = "Flower Light"
+            _LOGGER.debug("Could not request device info: %s", e)
+            info = None
 
-        try:
-            data = await self._client.read_gatt_char(CHAR_FIRMWARE)
-            self._firmware = data.decode("utf-8", errors="ignore").strip("\x00")
-            _LOGGER.debug("Firmware: %s", self._firmware)
-        except Exception as e:
-            _LOGGER.debug("Could not read firmware: %s", e)
+        if isinstance(info, dict):
+            if self._info_cached and info.get("fw") == self._firmware:
+                manufacturer = self._manufacturer
+            else:
+                manufacturer = await self._read_text(CHAR_MANUFACTURER)
+            model = info.get("m")
+            firmware = info.get("fw")
+            serial = info.get("sn")
+            if info.get("n"):
+                self.name = info["n"]
+        else:
+            manufacturer, model, firmware, serial = await asyncio.gather(
+                self._read_text(CHAR_MANUFACTURER),
+                self._read_text(CHAR_MODEL),
+                self._read_text(CHAR_FIRMWARE),
+                self._read_text(CHAR_SERIAL),
+            )
 
-        try:
-            data = await self._client.read_gatt_char(CHAR_SERIAL)
-            self._serial = data.decode("utf-8", errors="ignore").strip("\x00")
-            _LOGGER.debug("Serial: %s", self._serial)
-        except Exception as e:
-            _LOGGER.debug("Could not read serial: %s", e)
+        self._manufacturer = manufacturer if manufacturer is not None else "Unknown"
+        self._model = model if model is not None else "Flower Light"
+        if firmware is not None:
+            self._firmware = firmware
+        if serial is not None:
+            self._serial = serial
+        self._info_cached = self._firmware is not None
+        _LOGGER.debug(
+            "Device info: manufacturer=%s model=%s firmware=%s serial=%s",
+            self._manufacturer,
+            self._model,
+            self._firmware,
+            self._serial,
+        )
 
     async def _read_config(self) -> None:
         """Read device configuration."""
@@ -298,21 +1049,36 @@ class FlowerLightDevice:
             return
 
         try:
-            data = await self._client.read_gatt_char(CHAR_NAME)
-            device_name = data.decode("utf-8", errors="ignore").strip("\x00")
-            if device_name:
-                self.name = device_name
-                _LOGGER.debug("Device name: %s", device_name)
+            customization = await self._request(CMD_READ_CUSTOMIZATION)
         except Exception as e:
-            _LOGGER.debug("Could not read name: %s", e)
+            _LOGGER.debug("Could not request customization: %s", e)
+            customization = None
+
+        if isinstance(customization, dict) and "brg" in customization:
+            device_name = await self._read_text(CHAR_NAME)
+            self._brightness = customization["brg"]
+            _LOGGER.debug("Brightness config: %s", self._brightness)
+        else:
+            device_name, brightness = await asyncio.gather(
+                self._read_text(CHAR_NAME),
+                self._read_brightness(),
+            )
+            if brightness is not None:
+                self._brightness = brightness
+                _LOGGER.debug("Brightness config: %s", self._brightness)
 
+        if device_name:
+            self.name = device_name
+            _LOGGER.debug("Device name: %s", device_name)
+
+    async def _read_brightness(self) -> int | None:
+        """Read the brightness configuration characteristic."""
         try:
             data = await self._client.read_gatt_char(CHAR_BRIGHTNESS)
-            if len(data) > 0:
-                self._brightness = data[0]
-                _LOGGER.debug("Brightness config: %s", self._brightness)
         except Exception as e:
             _LOGGER.debug("Could not read brightness: %s", e)
+            return None
+        return data[0] if len(data) > 0 else None
 
     async def update_battery(self) -> int | None:
         """Update battery level."""
@@ -322,7 +1088,7 @@ class FlowerLightDevice:
         try:
             data = await self._client.read_gatt_char(CHAR_BATTERY_LEVEL)
             if len(data) > 0:
-                self._battery_level = data[0]
+                self._battery_level_handler(None, data)
                 return self._battery_level
         except Exception as e:
             _LOGGER.debug("Could not read battery level: %s", e)
@@ -353,6 +1119,11 @@ class FlowerLightDevice:
         """Return battery level."""
         return self._battery_level
 
+    @property
+    def charging(self) -> bool | None:
+        """Return if the battery is charging."""
+        return self._charging
+
     @property
     def model(self) -> str | None:
         """Return device model."""
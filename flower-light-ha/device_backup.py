@@ -1,10 +1,7 @@
 """Flower Light BLE device communication."""
 import asyncio
 import logging
-import math
-import random
 import struct
-import time
 from typing import Any, Callable
 
 import msgpack
@@ -15,10 +12,10 @@ from bleak_retry_connector import (
     establish_connection,
 )
 
-from .const import (
+from .animation import TickScheduler, WindWaveform
+from .const_backup import (
     CHAR_BATTERY_LEVEL,
     CHAR_BRIGHTNESS,
-    CHAR_COMMAND,
     CHAR_FIRMWARE,
     CHAR_MANUFACTURER,
     CHAR_MAX_OPEN,
@@ -38,6 +35,7 @@ from .const import (
     WIND_TICK_SECONDS_DEFAULT,
     WIND_TRANSITION_MS_DEFAULT,
 )
+from .protocol import StreamWriter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -63,7 +61,8 @@ class FlowerLightDevice:
         self._firmware = None
         self._serial = None
         self._wind_task: asyncio.Task | None = None
-        self._wind_started_at = 0.0
+        self._wind_scheduler: TickScheduler | None = None
+        self._writer = StreamWriter()
 
     async def connect(self) -> bool:
         """Connect to the device."""
@@ -79,6 +78,7 @@ class FlowerLightDevice:
             )
             
             _LOGGER.info("Connected to %s (%s)", self.name, self.address)
+            self._writer.reset()
             
             # Give device a moment to settle
             await asyncio.sleep(0.5)
@@ -183,7 +183,7 @@ class FlowerLightDevice:
         transition_ms = max(0, int(transition_ms))
 
         await self.stop_wind_mode()
-        self._wind_started_at = time.monotonic()
+        self._wind_scheduler = TickScheduler(tick_seconds)
         self._wind_task = asyncio.create_task(
             self._run_wind_mode(
                 min_open=min_open,
@@ -222,6 +222,18 @@ class FlowerLightDevice:
             self._wind_task.cancel()
         self._wind_task = None
 
+    @property
+    def wind_tick_rate(self) -> dict[str, float | int | None]:
+        """Return requested and achieved wind frames per second."""
+        scheduler = self._wind_scheduler
+        if scheduler is None:
+            return {}
+        return {
+            "requested": scheduler.requested_rate,
+            "achieved": scheduler.achieved_rate,
+            "skipped": scheduler.skipped,
+        }
+
     async def _run_wind_mode(
         self,
         min_open: int,
@@ -231,27 +243,24 @@ class FlowerLightDevice:
         transition_ms: int,
     ) -> None:
         """Run wind mode loop."""
+        waveform = WindWaveform(min_open, max_open, cycle_seconds, tick_seconds)
+        scheduler = self._wind_scheduler
+
+        async def _frame(index: int) -> None:
+            if not self.is_connected:
+                raise BleakError("Device not connected")
+            target_level = waveform.level(index)
+            self._petal_position = target_level
+            await self._send_command(
+                CMD_WRITE_PETALS,
+                {"l": target_level, "t": transition_ms},
+                stream=True,
+            )
+            if self._callback:
+                self._callback()
+
         try:
-            while self.is_connected:
-                elapsed = time.monotonic() - self._wind_started_at
-                phase = elapsed * (2 * math.pi / cycle_seconds)
-
-                base_wave = (math.sin(phase) + 1.0) / 2.0
-                gust_wave = (math.sin(phase * 0.47 + 1.2) + 1.0) / 2.0
-                jitter = (random.random() - 0.5) * 0.1
-                smooth = max(0.0, min(1.0, base_wave * 0.78 + gust_wave * 0.22 + jitter))
-                target_level = round(min_open + (max_open - min_open) * smooth)
-
-                self._petal_position = target_level
-                await self._send_command(
-                    CMD_WRITE_PETALS,
-                    {"l": target_level, "t": transition_ms},
-                )
-
-                if self._callback:
-                    self._callback()
-
-                await asyncio.sleep(tick_seconds)
+            await scheduler.run(_frame)
         except asyncio.CancelledError:
             _LOGGER.debug("Wind mode task cancelled")
             raise
@@ -259,9 +268,21 @@ class FlowerLightDevice:
             _LOGGER.warning("Wind mode stopped due to error: %s", e)
         finally:
             self._wind_task = None
+            _LOGGER.debug(
+                "Wind mode ran at %s/%.2f frames per second, %s stale frames skipped",
+                None if scheduler.achieved_rate is None else round(scheduler.achieved_rate, 2),
+                scheduler.requested_rate,
+                scheduler.skipped,
+            )
+
+    async def _send_command(
+        self, cmd_type: int, payload: dict[str, Any], stream: bool = False
+    ) -> None:
+        """Send a command to the device.
 
-    async def _send_command(self, cmd_type: int, payload: dict[str, Any]) -> None:
-        """Send a command to the device."""
+        Streamed frames are written without response when the device supports
+        it, see StreamWriter.
+        """
         if not self.is_connected:
             raise BleakError("Device not connected")
 
@@ -282,7 +303,7 @@ class FlowerLightDevice:
             packet.hex(),
         )
 
-        await self._client.write_gatt_char(CHAR_COMMAND, packet, response=True)
+        await self._writer.write(self._client, packet, stream=stream)
 
     async def turn_on(
         self,
@@ -0,0 +1,46 @@
+"""Diagnostics support for Flower Light."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_FLEET, DOMAIN
+from .device import FlowerLightDevice
+from .fleet import FlowerFleet
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    device: FlowerLightDevice = hass.data[DOMAIN][entry.entry_id]
+    fleet: FlowerFleet = hass.data[DOMAIN][DATA_FLEET]
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "device": {
+            **device.device_info_data,
+            "address": device.address,
+            "adapter": device.adapter,
+            "connected": device.is_connected,
+            "available": device.available,
+            "present": device.present,
+            "rssi": device.rssi,
+            "last_seen": device.last_seen,
+            "streaming": device.streaming,
+            "queue_depth": device.queue_depth,
+            "connect_count": device.connect_count,
+            "last_connect_duration": device.last_connect_duration,
+            "settle_time": device.settle_time,
+            "suppressed_state_writes": device.suppressed_state_writes,
+            "suppressed_commands": device.suppressed_commands,
+            "reduced_commands": device.reduced_commands,
+        },
+        "metrics": device.metrics.as_dict(),
+        "fleet_connect_summary": fleet.connect_summary(),
+    }
@@ -0,0 +1,143 @@
+"""Device events for the Flower Light integration."""
+from __future__ import annotations
+
+import asyncio
+from enum import StrEnum
+import logging
+import time
+from typing import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceEvent(StrEnum):
+    """Changes a device reports to its listeners."""
+
+    # Light color, brightness, on/off or petal position changed
+    STATE = "state"
+    # Battery level or charging state changed
+    BATTERY = "battery"
+    # Device connected, disconnected or changed availability
+    CONNECTION = "connection"
+
+
+class EventBus:
+    """Publish device events to any number of listeners.
+
+    Listeners are plain callables without arguments, called on the event loop
+    they subscribed from. Events published from another thread (some BLE
+    backends call notification handlers there) are handed over to that loop.
+    An event can be rate limited, merging bursts into one trailing dispatch.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bus."""
+        self._listeners: dict[DeviceEvent, list[Callable[[], None]]] = {}
+        self._limiters: dict[DeviceEvent, RateLimiter] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def subscribe(
+        self, event: DeviceEvent, listener: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Subscribe to an event, return a function unsubscribing again."""
+        self._loop = asyncio.get_running_loop()
+        self._listeners.setdefault(event, []).append(listener)
+
+        def _unsubscribe() -> None:
+            listeners = self._listeners.get(event, [])
+            if listener in listeners:
+                listeners.remove(listener)
+
+        return _unsubscribe
+
+    def set_rate(self, event: DeviceEvent, rate: float) -> None:
+        """Dispatch an event at most ``rate`` times per second, 0 is unlimited."""
+        if (limiter := self._limiters.get(event)) is None:
+            limiter = self._limiters[event] = RateLimiter(
+                lambda: self._call_listeners(event)
+            )
+        limiter.set_rate(rate)
+
+    def suppressed(self, event: DeviceEvent) -> int:
+        """Return how many dispatches of an event were merged by its rate limit."""
+        limiter = self._limiters.get(event)
+        return limiter.suppressed if limiter else 0
+
+    def has_listeners(self, event: DeviceEvent) -> bool:
+        """Return if anybody listens to an event."""
+        return bool(self._listeners.get(event))
+
+    def publish(self, event: DeviceEvent) -> None:
+        """Call the listeners of an event on the event loop."""
+        if not self._listeners.get(event) or self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._dispatch(event)
+        else:
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+
+    def _dispatch(self, event: DeviceEvent) -> None:
+        """Call the listeners of an event, through its rate limit if any."""
+        if (limiter := self._limiters.get(event)) is not None:
+            limiter()
+        else:
+            self._call_listeners(event)
+
+    def _call_listeners(self, event: DeviceEvent) -> None:
+        """Call the listeners of an event."""
+        for listener in list(self._listeners.get(event, ())):
+            try:
+                listener()
+            except Exception:  # noqa: BLE001 - one listener must not stop the rest
+                _LOGGER.exception("Error in %s listener", event)
+
+
+class RateLimiter:
+    """Call a function at most ``rate`` times per second.
+
+    Calls inside the interval are merged into one trailing call at its end,
+    so the last call always goes through. Listeners read the device state
+    when they run, so the trailing call carries the final value. A rate of 0
+    disables limiting.
+    """
+
+    def __init__(self, func: Callable[[], None], rate: float = 0) -> None:
+        """Initialize the limiter."""
+        self._func = func
+        self._interval = 0.0
+        self._last_call = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+        self.suppressed = 0
+        self.set_rate(rate)
+
+    def set_rate(self, rate: float) -> None:
+        """Change the maximum number of calls per second."""
+        self._interval = 1 / rate if rate > 0 else 0.0
+
+    def __call__(self) -> None:
+        """Call the function now or schedule a trailing call."""
+        if self._handle is not None:
+            # Merged into the pending trailing call
+            self.suppressed += 1
+            return
+        wait = self._last_call + self._interval - time.monotonic()
+        if wait <= 0:
+            self._run()
+            return
+        self._handle = asyncio.get_running_loop().call_later(wait, self._run)
+
+    def cancel(self) -> None:
+        """Drop a pending trailing call."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _run(self) -> None:
+        """Call the function."""
+        self._handle = None
+        self._last_call = time.monotonic()
+        self._func()
@@ -0,0 +1,134 @@
+"""Fan-out of commands to many Flower Light devices."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from .const import DEFAULT_FLEET_CONCURRENCY
+from .events import DeviceEvent
+from .metrics import summarize_connects
+
+if TYPE_CHECKING:
+    from .device import FlowerLightDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class FleetResult:
+    """Outcome of a command sent to the whole fleet."""
+
+    # Seconds from the start of the broadcast until the last device finished
+    duration: float = 0.0
+    # Seconds between the first and the last device finishing
+    skew: float = 0.0
+    completed: int = 0
+    failed: dict[str, BaseException] = field(default_factory=dict)
+
+
+class FlowerFleet:
+    """Group of devices driven by one logical command.
+
+    Commands fan out to all devices at once. Each BLE adapter (or proxy) only
+    gets a limited number of devices in flight, so one crowded adapter does not
+    stall the others.
+    """
+
+    def __init__(self, adapter_concurrency: int = DEFAULT_FLEET_CONCURRENCY) -> None:
+        """Initialize the fleet."""
+        self.adapter_concurrency = adapter_concurrency
+        self.last_result: FleetResult | None = None
+        # Light platforms of loaded entries and the one owning the fleet light
+        self.platforms: dict[str, Callable] = {}
+        self.entity_owner: str | None = None
+        self._devices: dict[str, FlowerLightDevice] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._unsubscribes: dict[str, list[Callable[[], None]]] = {}
+        self._semaphores: dict[str | None, asyncio.Semaphore] = {}
+
+    def __len__(self) -> int:
+        """Return the number of devices in the fleet."""
+        return len(self._devices)
+
+    @property
+    def devices(self) -> list[FlowerLightDevice]:
+        """Return the devices in the fleet."""
+        return list(self._devices.values())
+
+    def add(self, device: FlowerLightDevice) -> None:
+        """Add a device to the fleet."""
+        self.remove(device)
+        self._devices[device.address] = device
+        self._unsubscribes[device.address] = [
+            device.subscribe(event, self._publish)
+            for event in (DeviceEvent.STATE, DeviceEvent.CONNECTION)
+        ]
+        self._publish()
+
+    def remove(self, device: FlowerLightDevice) -> None:
+        """Remove a device from the fleet."""
+        for unsubscribe in self._unsubscribes.pop(device.address, ()):
+            unsubscribe()
+        if self._devices.pop(device.address, None) is not None:
+            self._publish()
+
+    def connect_summary(self) -> dict[str, dict[str, Any]]:
+        """Return p50/p95 per connect phase across the recent connects of the fleet."""
+        return summarize_connects(device.metrics for device in self._devices.values())
+
+    def subscribe(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Listen to state and connection changes of any device in the fleet."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _publish(self) -> None:
+        """Call the fleet listeners."""
+        for listener in list(self._listeners):
+            listener()
+
+    async def async_broadcast(
+        self,
+        action: Callable[[FlowerLightDevice], Awaitable[Any]],
+        devices: list[FlowerLightDevice] | None = None,
+    ) -> FleetResult:
+        """Run ``action`` on every device concurrently and report the skew."""
+        targets = self.devices if devices is None else devices
+        result = FleetResult()
+        if not targets:
+            return result
+
+        started = time.monotonic()
+        finished: list[float] = []
+
+        async def _run(device: FlowerLightDevice) -> None:
+            if (semaphore := self._semaphores.get(device.adapter)) is None:
+                semaphore = self._semaphores[device.adapter] = asyncio.Semaphore(
+                    self.adapter_concurrency
+                )
+            async with semaphore:
+                try:
+                    await action(device)
+                except Exception as err:  # noqa: BLE001 - reported per device
+                    _LOGGER.debug("Fleet command failed for %s: %s", device.address, err)
+                    result.failed[device.address] = err
+                    return
+            finished.append(time.monotonic())
+
+        await asyncio.gather(*(_run(device) for device in targets))
+
+        result.completed = len(finished)
+        result.duration = time.monotonic() - started
+        if finished:
+            result.skew = max(finished) - min(finished)
+        self.last_result = result
+        _LOGGER.debug(
+            "Fleet command reached %s/%s devices in %.3fs (skew %.3fs)",
+            result.completed,
+            len(targets),
+            result.duration,
+            result.skew,
+        )
+        return result
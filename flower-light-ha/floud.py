@@ -0,0 +1,296 @@
+"""Local Floud server for Flower Lights connected over WiFi.
+
+The firmware's WifiConnect opens a TCP connection to connect.floud.cz:3000
+and speaks the same framing as over BLE: a ``[type][id][len]`` header
+followed by a msgpack payload. Pointing that name at this server lets
+WiFi-connected flowers be controlled without BLE.
+
+The firmware handles one message at a time and reconnects when it gets no
+reply to its own requests within 2 seconds, so every device request is
+answered right away and at most one command per device is in flight.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import socket
+import time
+from typing import Any
+
+import msgpack
+
+from .const import (
+    CMD_WRITE_STATE,
+    FLOUD_PORT,
+    PROTOCOL_AUTH,
+    PROTOCOL_STATUS,
+    RESPONSE_TIMEOUT,
+    STATUS_OK,
+    STATUS_UNAUTHORIZED,
+)
+from .protocol import (
+    HEADER,
+    HEADER_SIZE,
+    MAX_PAYLOAD_BYTES,
+    CommandResponse,
+    PacketEncoder,
+    ResponseTracker,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Types below this are response statuses, the rest are requests
+_FIRST_REQUEST_TYPE = PROTOCOL_AUTH
+
+# Seconds a connection may take to authorize, and stay silent once authorized
+AUTH_TIMEOUT = 10.0
+IDLE_TIMEOUT = 300.0
+
+# Seconds between sweeps closing expired connections
+SWEEP_INTERVAL = 5.0
+
+# Listener of device messages: device id, message type and decoded payload
+DeviceListener = Callable[[str, int, Any], None]
+
+
+def _unpack(payload: bytes) -> Any:
+    """Decode a msgpack payload, None when empty or invalid."""
+    if not payload:
+        return None
+    try:
+        return msgpack.unpackb(payload, raw=False)
+    except (ValueError, msgpack.UnpackException):
+        return None
+
+
+class FloudConnection(asyncio.Protocol):
+    """TCP connection of one flower."""
+
+    def __init__(self, server: FloudServer) -> None:
+        """Initialize the connection."""
+        self._server = server
+        self._transport: asyncio.Transport | None = None
+        self._buffer = bytearray()
+        self._tracker = ResponseTracker()
+        self._command_lock = asyncio.Lock()
+        self._message_id = 1
+        self.device_id: str | None = None
+        self.connected_at = time.monotonic()
+        self.last_seen = self.connected_at
+        self.status: dict[str, Any] = {}
+        self.state: dict[str, Any] = {}
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Set up a new socket."""
+        self._transport = transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            # Each message must arrive as its own segment, the firmware reads
+            # one message per received chunk
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._server.connections.add(self)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Forget a closed socket."""
+        self._transport = None
+        self._tracker.fail_all(ConnectionError("Floud connection closed"))
+        self._server.connection_closed(self)
+
+    def data_received(self, data: bytes) -> None:
+        """Split received data into messages and handle them."""
+        self.last_seen = time.monotonic()
+        buffer = self._buffer
+        buffer += data
+        offset = 0
+        while len(buffer) - offset >= HEADER_SIZE:
+            msg_type, message_id, length = HEADER.unpack_from(buffer, offset)
+            if length > MAX_PAYLOAD_BYTES:
+                _LOGGER.debug("Oversized message from %s, closing", self.device_id)
+                self.close()
+                return
+            end = offset + HEADER_SIZE + length
+            if len(buffer) < end:
+                break
+            self._handle(msg_type, message_id, bytes(buffer[offset + HEADER_SIZE : end]))
+            offset = end
+            if self._transport is None:
+                return
+        if offset:
+            del buffer[:offset]
+
+    def _handle(self, msg_type: int, message_id: int, payload: bytes) -> None:
+        """Handle one message."""
+        if self.device_id is None:
+            if msg_type != PROTOCOL_AUTH:
+                self._reply(STATUS_UNAUTHORIZED, message_id)
+                return
+            device_id = self._server.authenticate(payload.decode(errors="replace"))
+            if device_id is None:
+                _LOGGER.debug("Rejected token from %s", self.peer)
+                self._reply(STATUS_UNAUTHORIZED, message_id)
+                self.close()
+                return
+            self.device_id = device_id
+            self._server.device_authorized(self)
+            self._reply(STATUS_OK, message_id)
+            return
+
+        if msg_type < _FIRST_REQUEST_TYPE:
+            # Response to a command sent by the server
+            self._tracker.resolve(message_id, CommandResponse(msg_type, _unpack(payload)))
+            return
+
+        # Requests of the device are always acknowledged; anything but OK would
+        # make the firmware reconnect or run the status as a command
+        self._reply(STATUS_OK, message_id)
+        data = _unpack(payload)
+        if msg_type == PROTOCOL_STATUS and isinstance(data, dict):
+            self.status = data
+        elif msg_type == CMD_WRITE_STATE and isinstance(data, dict):
+            self.state = data
+        self._server.dispatch(self.device_id, msg_type, data)
+
+    def _reply(self, status: int, message_id: int) -> None:
+        """Answer a message of the flower with a status."""
+        if self._transport is not None:
+            self._transport.write(HEADER.pack(status, message_id, 0))
+
+    async def send(
+        self,
+        cmd_type: int,
+        payload: dict[str, Any] | None = None,
+        timeout: float = RESPONSE_TIMEOUT,
+    ) -> CommandResponse:
+        """Send a command and wait for the response of the flower."""
+        async with self._command_lock:
+            if self._transport is None:
+                raise ConnectionError("Floud connection closed")
+            message_id = self._message_id
+            self._message_id = (message_id + 1) & 0xFFFF or 1
+            packet = self._server.encoder.encode(cmd_type, message_id, payload)
+            response = self._tracker.expect(message_id)
+            self._transport.write(packet)
+            return await asyncio.wait_for(response, timeout)
+
+    @property
+    def peer(self) -> Any:
+        """Return the remote address."""
+        return self._transport.get_extra_info("peername") if self._transport else None
+
+    def close(self) -> None:
+        """Close the socket."""
+        if self._transport is not None:
+            self._transport.close()
+
+
+class FloudServer:
+    """Accept flower connections and route commands to them by device id.
+
+    ``authenticate`` maps the token a flower sends in PROTOCOL_AUTH to its
+    device id, or None to reject it. Status and state pushes of the flowers
+    are passed to the listeners.
+    """
+
+    def __init__(self, authenticate: Callable[[str], str | None]) -> None:
+        """Initialize the server."""
+        self.authenticate = authenticate
+        self.encoder = PacketEncoder()
+        self.connections: set[FloudConnection] = set()
+        self._devices: dict[str, FloudConnection] = {}
+        self._listeners: list[DeviceListener] = []
+        self._server: asyncio.AbstractServer | None = None
+        self._sweep: asyncio.TimerHandle | None = None
+
+    async def start(self, host: str | None = None, port: int = FLOUD_PORT) -> None:
+        """Start listening."""
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: FloudConnection(self), host, port, backlog=1024
+        )
+        self._sweep = loop.call_later(SWEEP_INTERVAL, self._sweep_connections)
+        _LOGGER.info("Floud server listening on port %s", port)
+
+    async def stop(self) -> None:
+        """Close the server and every connection."""
+        if self._sweep is not None:
+            self._sweep.cancel()
+            self._sweep = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for connection in list(self.connections):
+            connection.close()
+
+    @property
+    def port(self) -> int | None:
+        """Return the port the server listens on."""
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def devices(self) -> list[str]:
+        """Return the ids of the connected flowers."""
+        return list(self._devices)
+
+    def connection(self, device_id: str) -> FloudConnection | None:
+        """Return the connection of a flower."""
+        return self._devices.get(device_id)
+
+    async def send(
+        self,
+        device_id: str,
+        cmd_type: int,
+        payload: dict[str, Any] | None = None,
+        timeout: float = RESPONSE_TIMEOUT,
+    ) -> CommandResponse:
+        """Send a command to a flower and return its response."""
+        if (connection := self._devices.get(device_id)) is None:
+            raise ConnectionError(f"Flower {device_id} is not connected")
+        return await connection.send(cmd_type, payload, timeout)
+
+    def subscribe(self, listener: DeviceListener) -> Callable[[], None]:
+        """Listen to status and state pushes, return a function unsubscribing."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def dispatch(self, device_id: str, msg_type: int, data: Any) -> None:
+        """Pass a message of a flower to the listeners."""
+        for listener in list(self._listeners):
+            try:
+                listener(device_id, msg_type, data)
+            except Exception:  # noqa: BLE001 - one listener must not stop the rest
+                _LOGGER.exception("Error in Floud listener")
+
+    def device_authorized(self, connection: FloudConnection) -> None:
+        """Route a flower to its newest connection."""
+        previous = self._devices.get(connection.device_id)
+        self._devices[connection.device_id] = connection
+        if previous is not None and previous is not connection:
+            _LOGGER.debug("Flower %s reconnected, closing old socket", connection.device_id)
+            previous.close()
+
+    def connection_closed(self, connection: FloudConnection) -> None:
+        """Forget a closed connection."""
+        self.connections.discard(connection)
+        if (
+            connection.device_id is not None
+            and self._devices.get(connection.device_id) is connection
+        ):
+            del self._devices[connection.device_id]
+
+    def _sweep_connections(self) -> None:
+        """Close connections that did not authorize or went silent."""
+        now = time.monotonic()
+        for connection in list(self.connections):
+            if connection.device_id is None:
+                expired = now - connection.connected_at > AUTH_TIMEOUT
+            else:
+                expired = now - connection.last_seen > IDLE_TIMEOUT
+            if expired:
+                connection.close()
+        self._sweep = asyncio.get_running_loop().call_later(
+            SWEEP_INTERVAL, self._sweep_connections
+        )
@@ -14,16 +14,20 @@ from homeassistant.components.light import (
     LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
+    DATA_FLEET,
     DEFAULT_TRANSITION_MS,
     DOMAIN,
     EFFECT_TO_ANIMATION_ID,
     EFFECT_LIST,
 )
+from .color import to_device_brightness, to_ha_brightness
 from .device import FlowerLightDevice
+from .events import DeviceEvent
+from .fleet import FlowerFleet
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +42,54 @@ async def async_setup_entry(
     
     async_add_entities([FlowerLight(device, entry)])
 
+    fleet: FlowerFleet = hass.data[DOMAIN][DATA_FLEET]
+    fleet.platforms[entry.entry_id] = async_add_entities
+    async_ensure_fleet_light(fleet)
+
+
+@callback
+def async_ensure_fleet_light(fleet: FlowerFleet) -> None:
+    """Add the fleet light through a loaded entry once two flowers are set up."""
+    if fleet.entity_owner is not None or len(fleet) < 2 or not fleet.platforms:
+        return
+    entry_id, async_add_entities = next(iter(fleet.platforms.items()))
+    fleet.entity_owner = entry_id
+    async_add_entities([FlowerFleetLight(fleet)])
+
+
+def _transition_ms(kwargs: dict[str, Any]) -> int:
+    """Convert HA transition (seconds) to device transition (milliseconds)."""
+    transition = kwargs.get(ATTR_TRANSITION, DEFAULT_TRANSITION_MS / 1000.0)
+    return int(transition * 1000)
+
+
+async def _async_turn_on(device: FlowerLightDevice, kwargs: dict[str, Any]) -> None:
+    """Apply a light turn on service call to a device."""
+    rgb = kwargs.get(ATTR_RGB_COLOR)
+    brightness = kwargs.get(ATTR_BRIGHTNESS)
+    effect = kwargs.get(ATTR_EFFECT)
+    transition_ms = _transition_ms(kwargs)
+
+    # Convert HA brightness (0-255) to device brightness (0-100)
+    brightness_pct = None
+    if brightness is not None:
+        brightness_pct = to_device_brightness(brightness)
+
+    if effect:
+        # Play animation effect
+        animation_id = EFFECT_TO_ANIMATION_ID.get(effect)
+        if animation_id is None:
+            _LOGGER.warning("Unsupported effect requested: %s", effect)
+            return
+        await device.play_animation(animation_id)
+    else:
+        # Regular color/brightness change
+        await device.turn_on(
+            rgb=rgb,
+            brightness=brightness_pct,
+            transition=transition_ms,
+        )
+
 
 class FlowerLight(LightEntity):
     """Representation of a Flower Light."""
@@ -48,10 +100,12 @@ class FlowerLight(LightEntity):
     _attr_supported_color_modes = {ColorMode.RGB}
     _attr_supported_features = LightEntityFeature.EFFECT | LightEntityFeature.TRANSITION
     _attr_effect_list = EFFECT_LIST
+    _attr_should_poll = False
 
     def __init__(self, device: FlowerLightDevice, entry: ConfigEntry) -> None:
         """Initialize the light."""
         self._device = device
+        self._requested_brightness: int | None = None
         self._attr_unique_id = f"{entry.unique_id}_light"
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.unique_id)},
@@ -59,14 +113,13 @@ class FlowerLight(LightEntity):
             "manufacturer": device.manufacturer or "Unknown",
             "model": device.model or "Flower Light",
             "sw_version": device.firmware_version,
+            "serial_number": device.serial_number,
         }
-        
-        # Set callback for state updates
-        device.set_state_callback(self._handle_state_update)
 
-    def _handle_state_update(self) -> None:
-        """Handle state update from device."""
-        self.schedule_update_ha_state()
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to state and connection changes of the device."""
+        for event in (DeviceEvent.STATE, DeviceEvent.CONNECTION):
+            self.async_on_remove(self._device.subscribe(event, self.async_write_ha_state))
 
     @property
     def is_on(self) -> bool:
@@ -77,7 +130,7 @@ class FlowerLight(LightEntity):
     def brightness(self) -> int:
         """Return the brightness of the light (0-255)."""
         # Device uses 0-100, HA uses 0-255
-        return int(self._device.brightness * 2.55)
+        return to_ha_brightness(self._device.brightness, self._requested_brightness)
 
     @property
     def rgb_color(self) -> tuple[int, int, int]:
@@ -87,44 +140,92 @@ class FlowerLight(LightEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self._device.is_connected
+        return self._device.available
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the light."""
-        rgb = kwargs.get(ATTR_RGB_COLOR)
-        brightness = kwargs.get(ATTR_BRIGHTNESS)
-        effect = kwargs.get(ATTR_EFFECT)
-        transition = kwargs.get(ATTR_TRANSITION, DEFAULT_TRANSITION_MS / 1000.0)
-        
-        # Convert HA transition (seconds) to device transition (milliseconds)
-        transition_ms = int(transition * 1000)
-        
-        # Convert HA brightness (0-255) to device brightness (0-100)
-        brightness_pct = None
-        if brightness is not None:
-            brightness_pct = int(brightness / 2.55)
-        
-        if effect:
-            # Play animation effect
-            animation_id = EFFECT_TO_ANIMATION_ID.get(effect)
-            if animation_id is None:
-                _LOGGER.warning("Unsupported effect requested: %s", effect)
-                return
-            await self._device.play_animation(animation_id)
-        else:
-            # Regular color/brightness change
-            await self._device.turn_on(
-                rgb=rgb,
-                brightness=brightness_pct,
-                transition=transition_ms,
-            )
-        
-        self.async_write_ha_state()
+        if ATTR_BRIGHTNESS in kwargs:
+            self._requested_brightness = kwargs[ATTR_BRIGHTNESS]
+        await _async_turn_on(self._device, kwargs)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
-        transition = kwargs.get(ATTR_TRANSITION, DEFAULT_TRANSITION_MS / 1000.0)
-        transition_ms = int(transition * 1000)
-        
-        await self._device.turn_off(transition=transition_ms)
-        self.async_write_ha_state()
+        await self._device.turn_off(transition=_transition_ms(kwargs))
+
+
+class FlowerFleetLight(LightEntity):
+    """Light driving every Flower Light at once."""
+
+    _attr_name = "All Flower Lights"
+    _attr_unique_id = f"{DOMAIN}_fleet"
+    _attr_icon = "mdi:flower-tulip"
+    _attr_color_mode = ColorMode.RGB
+    _attr_supported_color_modes = {ColorMode.RGB}
+    _attr_supported_features = LightEntityFeature.EFFECT | LightEntityFeature.TRANSITION
+    _attr_effect_list = EFFECT_LIST
+    _attr_should_poll = False
+
+    def __init__(self, fleet: FlowerFleet) -> None:
+        """Initialize the fleet light."""
+        self._fleet = fleet
+
+    @property
+    def _lead(self) -> FlowerLightDevice | None:
+        """Return the first device that is on, reported as the fleet state."""
+        devices = self._fleet.devices
+        return next((device for device in devices if device.is_on), None)
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if any flower is on."""
+        return self._lead is not None
+
+    @property
+    def brightness(self) -> int | None:
+        """Return the brightness of the first flower that is on."""
+        if (lead := self._lead) is None:
+            return None
+        return to_ha_brightness(lead.brightness)
+
+    @property
+    def rgb_color(self) -> tuple[int, int, int] | None:
+        """Return the color of the first flower that is on."""
+        if (lead := self._lead) is None:
+            return None
+        return lead.rgb_color
+
+    @property
+    def available(self) -> bool:
+        """Return if any flower is available."""
+        return any(device.available for device in self._fleet.devices)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return fleet size and timing of the last command."""
+        attributes: dict[str, Any] = {"flower_count": len(self._fleet)}
+        if (result := self._fleet.last_result) is not None:
+            attributes["last_command_duration"] = round(result.duration, 3)
+            attributes["last_command_skew"] = round(result.skew, 3)
+            attributes["last_command_failed"] = len(result.failed)
+        return attributes
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to state and connection changes of every flower."""
+        self.async_on_remove(self._fleet.subscribe(self.async_write_ha_state))
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release ownership so another entry can add the fleet light."""
+        self._fleet.entity_owner = None
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn on every flower."""
+        await self._fleet.async_broadcast(
+            lambda device: _async_turn_on(device, kwargs)
+        )
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn off every flower."""
+        transition_ms = _transition_ms(kwargs)
+        await self._fleet.async_broadcast(
+            lambda device: device.turn_off(transition=transition_ms)
+        )
@@ -17,14 +17,14 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import (
+from .const_backup import (
     DEFAULT_TRANSITION_MS,
     DOMAIN,
     EFFECT_TO_ANIMATION_ID,
     EFFECT_WIND,
     EFFECT_LIST,
 )
-from .device import FlowerLightDevice
+from .device_backup import FlowerLightDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -88,6 +88,13 @@ class FlowerLight(LightEntity):
         """Return the RGB color value."""
         return self._device.rgb_color
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the wind mode tick rate while it runs."""
+        if not self._device.wind_mode_active:
+            return None
+        return {"wind_tick_rate": self._device.wind_tick_rate}
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
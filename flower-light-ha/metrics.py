@@ -0,0 +1,275 @@
+"""Runtime metrics of Flower Light devices."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+import time
+from typing import Any
+
+from . import const
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Seconds over which the notification rate is measured
+RATE_WINDOW = 60.0
+
+# Connects kept per device for the phase timing summary
+CONNECT_HISTORY = 20
+
+# Phases of FlowerLightDevice.connect() in order. device_info, config and
+# read_state run concurrently, so their durations overlap.
+CONNECT_PHASES = (
+    "establish_connection",
+    "settle",
+    "start_notify",
+    "pairing_ack",
+    "device_info",
+    "config",
+    "read_state",
+)
+
+# Command type -> name used in attributes and diagnostics, e.g. 67 -> write_state
+COMMAND_NAMES = {
+    value: name[4:].lower()
+    for name, value in vars(const).items()
+    if name.startswith("CMD_") and isinstance(value, int)
+}
+
+
+def command_name(cmd_type: int) -> str:
+    """Return the name of a command type."""
+    return COMMAND_NAMES.get(cmd_type, str(cmd_type))
+
+
+class LatencyHistogram:
+    """Latencies counted in fixed buckets, with percentiles estimated from them."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize the histogram."""
+        self.buckets = buckets
+        # One count per bucket plus the overflow above the last bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def record(self, seconds: float) -> None:
+        """Add one latency."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile."""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram in milliseconds for diagnostics."""
+
+        def ms(value: float | None) -> float | None:
+            return None if value is None else round(value * 1000, 1)
+
+        labels = [f"<={ms(bound):g}ms" for bound in self.buckets] + [
+            f">{ms(self.buckets[-1]):g}ms"
+        ]
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.mean),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "max_ms": ms(self.max) if self.count else None,
+            "buckets": {
+                label: count for label, count in zip(labels, self.counts) if count
+            },
+        }
+
+
+class RateMeter:
+    """Events per minute over a sliding window."""
+
+    def __init__(self, window: float = RATE_WINDOW) -> None:
+        """Initialize the meter."""
+        self.window = window
+        self.total = 0
+        self._times: deque[float] = deque()
+
+    def record(self) -> None:
+        """Count one event."""
+        now = time.monotonic()
+        self._times.append(now)
+        self.total += 1
+        self._prune(now)
+
+    @property
+    def per_minute(self) -> float:
+        """Return the events per minute within the window."""
+        self._prune(time.monotonic())
+        return len(self._times) * 60 / self.window
+
+    def _prune(self, now: float) -> None:
+        """Forget events older than the window."""
+        times = self._times
+        while times and times[0] < now - self.window:
+            times.popleft()
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    """Return a percentile of the samples (nearest rank)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class ConnectTrace:
+    """Timing spans of the phases of one connect."""
+
+    def __init__(self) -> None:
+        """Start the trace."""
+        self.timestamp = time.time()
+        self.phases: dict[str, float] = {}
+        self.total: float | None = None
+        self.success: bool | None = None
+        self._started = time.monotonic()
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        """Time the enclosed block as a phase, also when it raises."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[phase] = time.monotonic() - started
+
+    async def timed(self, phase: str, awaitable: Any) -> Any:
+        """Await a coroutine as a phase, for phases run concurrently."""
+        with self.span(phase):
+            return await awaitable
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Set the duration of a phase measured elsewhere."""
+        self.phases[phase] = seconds
+
+    def finish(self, success: bool) -> None:
+        """End the trace."""
+        self.total = time.monotonic() - self._started
+        self.success = success
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace in milliseconds for diagnostics."""
+        return {
+            "timestamp": self.timestamp,
+            "success": self.success,
+            "total_ms": None if self.total is None else round(self.total * 1000, 1),
+            "phases_ms": {
+                phase: round(seconds * 1000, 1) for phase, seconds in self.phases.items()
+            },
+        }
+
+
+def summarize_connects(metrics: Iterable[DeviceMetrics]) -> dict[str, dict[str, Any]]:
+    """Return p50/p95 per connect phase across the recent connects of devices.
+
+    Only successful connects are included, so failed attempts don't skew the
+    startup profile.
+    """
+    samples: dict[str, list[float]] = {phase: [] for phase in (*CONNECT_PHASES, "total")}
+    for device_metrics in metrics:
+        for trace in device_metrics.connects:
+            if not trace.success:
+                continue
+            for phase, seconds in trace.phases.items():
+                samples.setdefault(phase, []).append(seconds)
+            samples["total"].append(trace.total)
+    return {
+        phase: {
+            "count": len(values),
+            "p50_ms": round(_percentile(values, 50) * 1000, 1),
+            "p95_ms": round(_percentile(values, 95) * 1000, 1),
+        }
+        for phase, values in samples.items()
+        if values
+    }
+
+
+class DeviceMetrics:
+    """Command, connection and notification metrics of one device."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.commands: dict[int, LatencyHistogram] = {}
+        self.write_errors = 0
+        self.timeouts = 0
+        self.max_queue_depth = 0
+        self.connect_attempts = 0
+        self.connect_failures = 0
+        self.reconnects = 0
+        self.disconnects = 0
+        self.establish_connection = LatencyHistogram()
+        self.notifications = RateMeter()
+        self.connects: deque[ConnectTrace] = deque(maxlen=CONNECT_HISTORY)
+
+    def record_command(self, cmd_type: int, seconds: float) -> None:
+        """Add the write latency of a command."""
+        if (histogram := self.commands.get(cmd_type)) is None:
+            histogram = self.commands[cmd_type] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_queue_depth(self, depth: int) -> None:
+        """Track the deepest command queue seen."""
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def command_percentile(self, percent: float) -> float | None:
+        """Return a latency percentile across all command types."""
+        merged = LatencyHistogram()
+        for histogram in self.commands.values():
+            merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+            merged.count += histogram.count
+            merged.max = max(merged.max, histogram.max)
+        return merged.percentile(percent)
+
+    @property
+    def errors(self) -> int:
+        """Return failed writes and response timeouts."""
+        return self.write_errors + self.timeouts
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics for diagnostics."""
+        return {
+            "commands": {
+                command_name(cmd_type): histogram.as_dict()
+                for cmd_type, histogram in sorted(self.commands.items())
+            },
+            "write_errors": self.write_errors,
+            "timeouts": self.timeouts,
+            "max_queue_depth": self.max_queue_depth,
+            "connect_attempts": self.connect_attempts,
+            "connect_failures": self.connect_failures,
+            "reconnects": self.reconnects,
+            "disconnects": self.disconnects,
+            "establish_connection": self.establish_connection.as_dict(),
+            "notifications_total": self.notifications.total,
+            "notifications_per_minute": self.notifications.per_minute,
+            "connects": [trace.as_dict() for trace in self.connects],
+            "connect_summary": summarize_connects([self]),
+        }
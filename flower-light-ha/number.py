@@ -10,6 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .device import FlowerLightDevice
+from .events import DeviceEvent
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +37,7 @@ class FlowerPetalPosition(NumberEntity):
     _attr_native_step = 1
     _attr_native_unit_of_measurement = "%"
     _attr_mode = NumberMode.SLIDER
+    _attr_should_poll = False
 
     def __init__(self, device: FlowerLightDevice, entry: ConfigEntry) -> None:
         """Initialize the number entity."""
@@ -45,6 +47,11 @@ class FlowerPetalPosition(NumberEntity):
             "identifiers": {(DOMAIN, entry.unique_id)},
         }
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to state and connection changes of the device."""
+        for event in (DeviceEvent.STATE, DeviceEvent.CONNECTION):
+            self.async_on_remove(self._device.subscribe(event, self.async_write_ha_state))
+
     @property
     def native_value(self) -> float:
         """Return the current petal position."""
@@ -53,9 +60,8 @@ class FlowerPetalPosition(NumberEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self._device.is_connected
+        return self._device.available
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the petal position."""
         await self._device.set_petal_position(int(value))
-        self.async_write_ha_state()
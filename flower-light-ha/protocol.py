@@ -0,0 +1,183 @@
+"""Flower Light command protocol encoding."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import struct
+from typing import TYPE_CHECKING, Any
+
+import msgpack
+
+from .const import CHAR_COMMAND, STATUS_OK, STREAM_WINDOW
+
+if TYPE_CHECKING:
+    from bleak import BleakClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# Firmware expects: [type(2B)][id(2B)][payload_len(2B)] + msgpack payload
+HEADER = struct.Struct(">HHH")
+HEADER_SIZE = HEADER.size
+MAX_PAYLOAD_BYTES = 255
+
+# StatePacketData on CHAR_STATE: petals open level (int8) and R, G, B (uint8)
+STATE_DATA = struct.Struct("<bBBB")
+
+_EMPTY_PAYLOAD = msgpack.packb({}, use_bin_type=True)
+
+
+def decode_state(data: bytes | bytearray) -> tuple[int, int, int, int]:
+    """Decode StatePacketData into petals level, red, green and blue."""
+    return STATE_DATA.unpack_from(data)
+
+
+def decode_packet(data: bytes | bytearray) -> tuple[int, int, Any]:
+    """Decode a packet into its type, message id and payload."""
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"Packet too short: {len(data)} bytes")
+    cmd_type, message_id, length = HEADER.unpack_from(data)
+    if len(data) < HEADER_SIZE + length:
+        raise ValueError(f"Packet payload incomplete: {len(data) - HEADER_SIZE}/{length} bytes")
+    payload = None
+    if length:
+        payload = msgpack.unpackb(bytes(data[HEADER_SIZE : HEADER_SIZE + length]), raw=False)
+    return cmd_type, message_id, payload
+
+
+def encode_packet(cmd_type: int, message_id: int, payload: dict[str, Any] | None) -> bytes:
+    """Encode a command packet with a one-off msgpack encoder."""
+    payload_bytes = msgpack.packb(payload or {}, use_bin_type=True)
+    if len(payload_bytes) > MAX_PAYLOAD_BYTES:
+        raise ValueError(f"Command payload too large: {len(payload_bytes)} bytes")
+    return HEADER.pack(cmd_type, message_id, len(payload_bytes)) + payload_bytes
+
+
+class PacketEncoder:
+    """Reusable command packet encoder.
+
+    msgpack.packb builds a new Packer (and its internal buffer) on every call.
+    This encoder keeps one Packer per device and a precompiled header struct,
+    and produces the same bytes as encode_packet.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the encoder."""
+        self._pack = msgpack.Packer(use_bin_type=True).pack
+
+    def encode(self, cmd_type: int, message_id: int, payload: dict[str, Any] | None) -> bytes:
+        """Encode a command packet."""
+        payload_bytes = self._pack(payload) if payload else _EMPTY_PAYLOAD
+        if len(payload_bytes) > MAX_PAYLOAD_BYTES:
+            raise ValueError(f"Command payload too large: {len(payload_bytes)} bytes")
+        return HEADER.pack(cmd_type, message_id, len(payload_bytes)) + payload_bytes
+
+
+@dataclass(frozen=True)
+class CommandResponse:
+    """Response of the device to a command."""
+
+    status: int
+    payload: Any = None
+
+    @property
+    def ok(self) -> bool:
+        """Return if the device accepted the command."""
+        return self.status == STATUS_OK
+
+
+class ResponseTracker:
+    """Map message ids of outstanding commands to futures of their responses.
+
+    Any number of commands may be outstanding; each future is resolved by the
+    response carrying its message id, or dropped when the caller stops waiting
+    (for example on timeout).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._pending: dict[int, asyncio.Future[CommandResponse]] = {}
+
+    @property
+    def outstanding(self) -> int:
+        """Return the number of commands waiting for a response."""
+        return len(self._pending)
+
+    def expect(self, message_id: int) -> asyncio.Future[CommandResponse]:
+        """Register a command and return the future of its response."""
+        future: asyncio.Future[CommandResponse] = asyncio.get_running_loop().create_future()
+        if (previous := self._pending.get(message_id)) is not None:
+            # Message ids wrap at 16 bits, the old command can't be matched anymore
+            previous.cancel()
+        self._pending[message_id] = future
+        future.add_done_callback(lambda done: self._discard(message_id, done))
+        return future
+
+    def resolve(self, message_id: int, response: CommandResponse) -> bool:
+        """Resolve the command with the given message id."""
+        future = self._pending.pop(message_id, None)
+        if future is None or future.done():
+            return False
+        future.set_result(response)
+        return True
+
+    def fail_all(self, err: Exception) -> None:
+        """Fail every outstanding command."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(err)
+
+    def _discard(self, message_id: int, future: asyncio.Future) -> None:
+        """Forget a finished future unless its id was reused."""
+        if self._pending.get(message_id) is future:
+            del self._pending[message_id]
+
+
+class StreamWriter:
+    """Write command packets, streaming frames without response.
+
+    Streamed frames are written without response when the command
+    characteristic supports it, with at most ``window`` frames in flight.
+    GATT writes are ordered, so the next acknowledged write confirms every
+    frame written before it and restores the window. Other packets always use
+    acknowledged writes.
+    """
+
+    def __init__(self, window: int = STREAM_WINDOW) -> None:
+        """Initialize the writer."""
+        self._window = window
+        self._credits = window
+        self._supported: bool | None = None
+
+    def reset(self) -> None:
+        """Start over on a new connection."""
+        self._credits = self._window
+        self._supported = None
+
+    def supports_streaming(self, client: BleakClient) -> bool:
+        """Return if the command characteristic accepts write-without-response."""
+        if self._supported is None:
+            try:
+                char = client.services.get_characteristic(CHAR_COMMAND)
+                self._supported = (
+                    char is not None and "write-without-response" in char.properties
+                )
+            except Exception as e:
+                _LOGGER.debug("Could not inspect command characteristic: %s", e)
+                self._supported = False
+            if not self._supported:
+                _LOGGER.debug(
+                    "No write-without-response on the command characteristic, "
+                    "streamed frames use acknowledged writes"
+                )
+        return self._supported
+
+    async def write(self, client: BleakClient, packet: bytes, stream: bool = False) -> None:
+        """Write a packet, without response if streamed and the window allows."""
+        if stream and self._credits > 0 and self.supports_streaming(client):
+            self._credits -= 1
+            await client.write_gatt_char(CHAR_COMMAND, packet, response=False)
+            return
+        await client.write_gatt_char(CHAR_COMMAND, packet, response=True)
+        self._credits = self._window
@@ -9,12 +9,20 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 from .device import FlowerLightDevice
+from .events import DeviceEvent
+from .metrics import command_name
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,7 +35,20 @@ async def async_setup_entry(
     """Set up Flower Light sensor entities."""
     device: FlowerLightDevice = hass.data[DOMAIN][entry.entry_id]
     
-    async_add_entities([FlowerBatterySensor(device, entry)])
+    async_add_entities(
+        [
+            FlowerBatterySensor(device, entry),
+            FlowerConnectTimeSensor(device, entry),
+            FlowerSuppressedWritesSensor(device, entry),
+            FlowerSuppressedCommandsSensor(device, entry),
+            FlowerCommandLatencySensor(device, entry),
+            FlowerCommandErrorsSensor(device, entry),
+            FlowerQueueDepthSensor(device, entry),
+            FlowerReconnectsSensor(device, entry),
+            FlowerNotificationRateSensor(device, entry),
+            FlowerSignalStrengthSensor(device, entry),
+        ]
+    )
 
 
 class FlowerBatterySensor(SensorEntity):
@@ -38,6 +59,7 @@ class FlowerBatterySensor(SensorEntity):
     _attr_device_class = SensorDeviceClass.BATTERY
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_should_poll = False
 
     def __init__(self, device: FlowerLightDevice, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -47,6 +69,11 @@ class FlowerBatterySensor(SensorEntity):
             "identifiers": {(DOMAIN, entry.unique_id)},
         }
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to battery and connection changes of the device."""
+        for event in (DeviceEvent.BATTERY, DeviceEvent.CONNECTION):
+            self.async_on_remove(self._device.subscribe(event, self.async_write_ha_state))
+
     @property
     def native_value(self) -> int | None:
         """Return the battery level."""
@@ -55,8 +82,255 @@ class FlowerBatterySensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self._device.is_connected
+        return self._device.available
+
+
+class FlowerConnectTimeSensor(SensorEntity):
+    """Duration of the last connect, to tune the idle timeout."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Connect time"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 2
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = False
+
+    def __init__(self, device: FlowerLightDevice, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._device = device
+        self._attr_unique_id = f"{entry.unique_id}_connect_time"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.unique_id)},
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to connection changes of the device."""
+        self.async_on_remove(
+            self._device.subscribe(DeviceEvent.CONNECTION, self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return how long the last connect took."""
+        return self._device.last_connect_duration
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int | float | None]:
+        """Return the number of connects and the time in establish_connection."""
+        establish = self._device.metrics.establish_connection
+        return {
+            "connect_count": self._device.connect_count,
+            "establish_connection": establish.last,
+            "establish_connection_p95": establish.percentile(95),
+        }
+
+
+class FlowerSuppressedWritesSensor(SensorEntity):
+    """State updates merged by the state write rate limit."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Suppressed state updates"
+    _attr_icon = "mdi:speedometer-slow"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, device: FlowerLightDevice, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._device = device
+        self._attr_unique_id = f"{entry.unique_id}_suppressed_state_writes"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.unique_id)},
+        }
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of suppressed state updates."""
+        return self._device.suppressed_state_writes
+
 
-    async def async_update(self) -> None:
-        """Update the battery level."""
-        await self._device.update_battery()
+class FlowerSuppressedCommandsSensor(SensorEntity):
+    """State commands dropped because the flower already showed the state."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Suppressed commands"
+    _attr_icon = "mdi:message-minus-outline"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, device: FlowerLightDevice, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._device = device
+        self._attr_unique_id = f"{entry.unique_id}_suppressed_commands"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.unique_id)},
+        }
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of dropped commands."""
+        return self._device.suppressed_commands
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the number of commands reduced to their changed fields."""
+        return {"reduced_commands": self._device.reduced_commands}
+
+
+class FlowerMetricSensor(SensorEntity):
+    """Diagnostic sensor reading a device metric, polled."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _key: str
+
+    def __init__(self, device: FlowerLightDevice, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._device = device
+        self._attr_unique_id = f"{entry.unique_id}_{self._key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.unique_id)},
+        }
+
+
+class FlowerCommandLatencySensor(FlowerMetricSensor):
+    """95th percentile of command write latency."""
+
+    _key = "command_latency"
+    _attr_name = "Command latency"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the 95th percentile latency across all commands."""
+        if (latency := self._device.metrics.command_percentile(95)) is None:
+            return None
+        return round(latency * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | int | None]:
+        """Return count and percentiles per command type."""
+        attributes: dict[str, float | int | None] = {}
+        for cmd_type, histogram in self._device.metrics.commands.items():
+            name = command_name(cmd_type)
+            attributes[f"{name}_count"] = histogram.count
+            for percent in (50, 95):
+                latency = histogram.percentile(percent)
+                attributes[f"{name}_p{percent}"] = round(latency * 1000, 1)
+        return attributes
+
+
+class FlowerCommandErrorsSensor(FlowerMetricSensor):
+    """Failed command writes and response timeouts."""
+
+    _key = "command_errors"
+    _attr_name = "Command errors"
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of command errors."""
+        return self._device.metrics.errors
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the errors by kind."""
+        metrics = self._device.metrics
+        return {"write_errors": metrics.write_errors, "timeouts": metrics.timeouts}
+
+
+class FlowerQueueDepthSensor(FlowerMetricSensor):
+    """Commands waiting to be written."""
+
+    _key = "queue_depth"
+    _attr_name = "Command queue depth"
+    _attr_icon = "mdi:tray-full"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> int:
+        """Return the current queue depth."""
+        return self._device.queue_depth
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the deepest queue seen."""
+        return {"max_queue_depth": self._device.metrics.max_queue_depth}
+
+
+class FlowerReconnectsSensor(FlowerMetricSensor):
+    """Successful connects after the first one."""
+
+    _key = "reconnects"
+    _attr_name = "Reconnects"
+    _attr_icon = "mdi:bluetooth-connect"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of reconnects."""
+        return self._device.metrics.reconnects
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return connect attempts, failures and unexpected disconnects."""
+        metrics = self._device.metrics
+        return {
+            "connect_attempts": metrics.connect_attempts,
+            "connect_failures": metrics.connect_failures,
+            "disconnects": metrics.disconnects,
+        }
+
+
+class FlowerNotificationRateSensor(FlowerMetricSensor):
+    """Notifications received from the flower per minute."""
+
+    _key = "notification_rate"
+    _attr_name = "Notification rate"
+    _attr_icon = "mdi:bell-ring-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "notifications/min"
+
+    @property
+    def native_value(self) -> float:
+        """Return the notifications per minute over the last minute."""
+        return round(self._device.metrics.notifications.per_minute, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the total number of notifications."""
+        return {"notifications_total": self._device.metrics.notifications.total}
+
+
+class FlowerSignalStrengthSensor(FlowerMetricSensor):
+    """Signal strength of the last advertisement."""
+
+    _key = "rssi"
+    _attr_name = "Signal strength"
+    _attr_device_class = SensorDeviceClass.SIGNAL_STRENGTH
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = SIGNAL_STRENGTH_DECIBELS_MILLIWATT
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the RSSI of the last advertisement."""
+        return self._device.rssi
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str | bool | None]:
+        """Return when the flower was last seen and if it is in range."""
+        last_seen = self._device.last_seen
+        return {
+            "last_seen": None
+            if last_seen is None
+            else dt_util.utc_from_timestamp(last_seen).isoformat(),
+            "present": self._device.present,
+        }
@@ -0,0 +1,434 @@
+"""Simulated Flower Light for testing without hardware.
+
+SimulatedFlower emulates the firmware side of the BLE protocol: it decodes
+commands, updates its state, notifies CHAR_STATE and battery changes, and
+optionally answers commands with STATUS codes. Latency, packet loss and
+disconnects are injected per operation. Pass ``simulator.connect`` as the
+connector of FlowerLightDevice:
+
+    flower = SimulatedFlower(SimulatorConfig(write_latency=0.02, loss_rate=0.01))
+    device = FlowerLightDevice(flower.ble_device, connector=flower.connect)
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import random
+import time
+from typing import Any, Callable
+
+from bleak.exc import BleakError
+import msgpack
+
+from .const import (
+    CHAR_BATTERY_LEVEL,
+    CHAR_BATTERY_POWER_STATE,
+    CHAR_BRIGHTNESS,
+    CHAR_COMMAND,
+    CHAR_FIRMWARE,
+    CHAR_MANUFACTURER,
+    CHAR_MAX_OPEN,
+    CHAR_MODEL,
+    CHAR_NAME,
+    CHAR_SERIAL,
+    CHAR_SPEED,
+    CHAR_STATE,
+    CMD_PLAY_ANIMATION,
+    CMD_READ_CUSTOMIZATION,
+    CMD_READ_DEVICE_INFO,
+    CMD_READ_STATE,
+    CMD_WRITE_CUSTOMIZATION,
+    CMD_WRITE_PETALS,
+    CMD_WRITE_RGB_COLOR,
+    CMD_WRITE_STATE,
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_UNSUPPORTED,
+)
+from .protocol import HEADER, STATE_DATA, decode_packet
+
+_LOGGER = logging.getLogger(__name__)
+
+# Battery Power State values reported by the firmware
+POWER_STATE_CHARGING = 0x3B
+POWER_STATE_DISCHARGING = 0x2F
+
+# Last animation id accepted by the firmware (Wind); 255 stops animations
+_MAX_ANIMATION = 3
+_STOP_ANIMATION = 255
+
+
+@dataclass
+class SimulatorConfig:
+    """Behavior of the simulated flower and its radio link."""
+
+    # Seconds each operation takes, plus up to ``jitter`` seconds at random
+    connect_latency: float = 0.0
+    read_latency: float = 0.0
+    write_latency: float = 0.0
+    notify_latency: float = 0.0
+    jitter: float = 0.0
+    # Seconds after connecting before notifications can be enabled
+    settle_time: float = 0.0
+    # Probability of a failing connect, a lost write and a dropped link per
+    # operation
+    connect_failure_rate: float = 0.0
+    loss_rate: float = 0.0
+    disconnect_rate: float = 0.0
+    # Answer commands with STATUS packets on CHAR_COMMAND notifications; the
+    # firmware does not do this over BLE
+    responses: bool = False
+    write_without_response: bool = False
+    seed: int | None = None
+
+
+@dataclass
+class SimulatorStats:
+    """Counters of what happened on the simulated link."""
+
+    connects: int = 0
+    failed_connects: int = 0
+    disconnects: int = 0
+    reads: int = 0
+    writes: int = 0
+    lost_writes: int = 0
+    commands: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class _Characteristic:
+    """GATT characteristic as exposed by bleak."""
+
+    uuid: str
+    properties: list[str]
+
+
+class _Services:
+    """GATT service collection as exposed by bleak."""
+
+    def __init__(self, characteristics: list[_Characteristic]) -> None:
+        self._characteristics = {char.uuid: char for char in characteristics}
+
+    def get_characteristic(self, uuid: str) -> _Characteristic | None:
+        """Return a characteristic by UUID."""
+        return self._characteristics.get(uuid)
+
+
+@dataclass
+class SimulatedBLEDevice:
+    """Stand-in for the BLEDevice Home Assistant passes to the integration."""
+
+    address: str
+    name: str
+    details: dict[str, Any] = field(default_factory=lambda: {"source": "simulator"})
+
+
+class SimulatedClient:
+    """GATT client connected to a SimulatedFlower."""
+
+    def __init__(
+        self,
+        flower: SimulatedFlower,
+        disconnected_callback: Callable[[SimulatedClient], None] | None,
+    ) -> None:
+        """Initialize the client."""
+        self._flower = flower
+        self._disconnected_callback = disconnected_callback
+        self._connected_at = time.monotonic()
+        self._notify: dict[str, Callable[[Any, bytearray], None]] = {}
+        self.is_connected = True
+        self.services = flower.services
+
+    async def read_gatt_char(self, char_uuid: str) -> bytearray:
+        """Read a characteristic."""
+        await self._operation(self._flower.config.read_latency)
+        self._flower.stats.reads += 1
+        return bytearray(self._flower.read(char_uuid))
+
+    async def write_gatt_char(
+        self, char_uuid: str, data: bytes, response: bool = False
+    ) -> None:
+        """Write a characteristic."""
+        config = self._flower.config
+        # A write without response returns once queued; the packet reaches the
+        # flower after the one-way delay instead of a full round trip
+        await self._operation(config.write_latency if response else 0.0)
+        self._flower.stats.writes += 1
+        if config.loss_rate and self._flower.random.random() < config.loss_rate:
+            self._flower.stats.lost_writes += 1
+            if response:
+                raise BleakError("Simulated write failure")
+            return
+        if char_uuid != CHAR_COMMAND:
+            return
+        if response:
+            self._flower.handle_packet(bytes(data))
+        else:
+            asyncio.get_running_loop().call_later(
+                config.write_latency / 2, self._flower.handle_packet, bytes(data)
+            )
+
+    async def start_notify(
+        self, char_uuid: str, callback: Callable[[Any, bytearray], None]
+    ) -> None:
+        """Subscribe to a characteristic."""
+        await self._operation(self._flower.config.write_latency)
+        if time.monotonic() - self._connected_at < self._flower.config.settle_time:
+            raise BleakError("Simulated device not ready")
+        char = self.services.get_characteristic(char_uuid)
+        if char is None or "notify" not in char.properties:
+            raise BleakError(f"Characteristic {char_uuid} does not notify")
+        self._notify[char_uuid] = callback
+
+    async def stop_notify(self, char_uuid: str) -> None:
+        """Unsubscribe from a characteristic."""
+        self._notify.pop(char_uuid, None)
+
+    async def disconnect(self) -> bool:
+        """Disconnect on request of the host."""
+        self._drop()
+        return True
+
+    def notify(self, char_uuid: str, data: bytes) -> None:
+        """Deliver a notification after the notify latency."""
+        if not self.is_connected or (callback := self._notify.get(char_uuid)) is None:
+            return
+        delay = self._flower.latency(self._flower.config.notify_latency)
+        asyncio.get_running_loop().call_later(delay, self._deliver, callback, data)
+
+    def _deliver(self, callback: Callable[[Any, bytearray], None], data: bytes) -> None:
+        """Call a notification handler if the link is still up."""
+        if self.is_connected:
+            callback(None, bytearray(data))
+
+    async def _operation(self, latency: float) -> None:
+        """Wait for an operation and inject random disconnects."""
+        if not self.is_connected:
+            raise BleakError("Not connected")
+        if delay := self._flower.latency(latency):
+            await asyncio.sleep(delay)
+        config = self._flower.config
+        if config.disconnect_rate and self._flower.random.random() < config.disconnect_rate:
+            self._flower.drop_connection()
+        if not self.is_connected:
+            raise BleakError("Simulated disconnect")
+
+    def _drop(self) -> None:
+        """Mark the link down and tell the host."""
+        if not self.is_connected:
+            return
+        self.is_connected = False
+        self._notify.clear()
+        self._flower.stats.disconnects += 1
+        if self._disconnected_callback is not None:
+            asyncio.get_running_loop().call_soon(self._disconnected_callback, self)
+
+
+class SimulatedFlower:
+    """Firmware model of one flower."""
+
+    def __init__(
+        self,
+        config: SimulatorConfig | None = None,
+        address: str = "AA:BB:CC:DD:EE:FF",
+        name: str = "Floower",
+    ) -> None:
+        """Initialize the flower."""
+        self.config = config or SimulatorConfig()
+        self.random = random.Random(self.config.seed)
+        self.stats = SimulatorStats()
+        self.ble_device = SimulatedBLEDevice(address, name)
+        self.client: SimulatedClient | None = None
+
+        self.name = name
+        self.model = "Floower"
+        self.manufacturer = "Floower"
+        self.firmware = "4.1"
+        self.hardware = "7"
+        self.serial = "SIM" + address.replace(":", "")[-6:]
+        self.level = 0
+        self.color = (0, 0, 0)
+        self.animation: int | None = None
+        self.speed = 10
+        self.brightness = 70
+        self.max_open = 100
+        self.battery_level = 100
+        self.charging = False
+
+        command_properties = ["write"]
+        if self.config.write_without_response:
+            command_properties.append("write-without-response")
+        if self.config.responses:
+            command_properties.append("notify")
+        self.services = _Services(
+            [
+                _Characteristic(CHAR_COMMAND, command_properties),
+                _Characteristic(CHAR_STATE, ["read", "notify"]),
+                _Characteristic(CHAR_BATTERY_LEVEL, ["read", "notify"]),
+                _Characteristic(CHAR_BATTERY_POWER_STATE, ["read", "notify"]),
+                *(
+                    _Characteristic(uuid, ["read"])
+                    for uuid in (
+                        CHAR_NAME,
+                        CHAR_SPEED,
+                        CHAR_BRIGHTNESS,
+                        CHAR_MAX_OPEN,
+                        CHAR_MODEL,
+                        CHAR_SERIAL,
+                        CHAR_FIRMWARE,
+                        CHAR_MANUFACTURER,
+                    )
+                ),
+            ]
+        )
+
+    def latency(self, base: float) -> float:
+        """Return an operation latency with jitter applied."""
+        if self.config.jitter:
+            return base + self.random.random() * self.config.jitter
+        return base
+
+    async def connect(
+        self,
+        client_class: Any,
+        device: Any,
+        name: str,
+        disconnected_callback: Callable[[SimulatedClient], None] | None = None,
+        **kwargs: Any,
+    ) -> SimulatedClient:
+        """Connect like bleak_retry_connector.establish_connection."""
+        if delay := self.latency(self.config.connect_latency):
+            await asyncio.sleep(delay)
+        if (
+            self.config.connect_failure_rate
+            and self.random.random() < self.config.connect_failure_rate
+        ):
+            self.stats.failed_connects += 1
+            raise BleakError("Simulated connection failure")
+        if self.client is not None:
+            self.client._drop()
+        self.client = SimulatedClient(self, disconnected_callback)
+        self.stats.connects += 1
+        return self.client
+
+    def drop_connection(self) -> None:
+        """Drop the link as if the flower went out of range."""
+        if self.client is not None:
+            self.client._drop()
+
+    def set_battery(self, level: int, charging: bool | None = None) -> None:
+        """Change the battery and notify the host."""
+        self.battery_level = level
+        if charging is not None:
+            self.charging = charging
+        if self.client is not None:
+            self.client.notify(CHAR_BATTERY_LEVEL, bytes([level]))
+            self.client.notify(CHAR_BATTERY_POWER_STATE, self._power_state())
+
+    def read(self, char_uuid: str) -> bytes:
+        """Return the value of a characteristic."""
+        if char_uuid == CHAR_STATE:
+            return self._state_data()
+        if char_uuid == CHAR_BATTERY_LEVEL:
+            return bytes([self.battery_level])
+        if char_uuid == CHAR_BATTERY_POWER_STATE:
+            return self._power_state()
+        if char_uuid == CHAR_BRIGHTNESS:
+            return bytes([self.brightness])
+        if char_uuid == CHAR_SPEED:
+            return bytes([self.speed])
+        if char_uuid == CHAR_MAX_OPEN:
+            return bytes([self.max_open])
+        text = {
+            CHAR_NAME: self.name,
+            CHAR_MODEL: self.model,
+            CHAR_SERIAL: self.serial,
+            CHAR_FIRMWARE: self.firmware,
+            CHAR_MANUFACTURER: self.manufacturer,
+        }.get(char_uuid)
+        if text is None:
+            raise BleakError(f"Characteristic {char_uuid} not found")
+        return text.encode()
+
+    def handle_packet(self, data: bytes) -> None:
+        """Run a command packet like CommandProtocol::run."""
+        try:
+            cmd_type, message_id, payload = decode_packet(data)
+        except ValueError:
+            return
+        self.stats.commands[cmd_type] = self.stats.commands.get(cmd_type, 0) + 1
+        status, response = self._run(cmd_type, payload if isinstance(payload, dict) else {})
+        if self.config.responses and self.client is not None:
+            body = msgpack.packb(response, use_bin_type=True) if response else b""
+            self.client.notify(CHAR_COMMAND, HEADER.pack(status, message_id, len(body)) + body)
+
+    def _run(self, cmd_type: int, payload: dict[str, Any]) -> tuple[int, Any]:
+        """Apply a command, return its status and response payload."""
+        if cmd_type == CMD_WRITE_PETALS:
+            if 0 <= payload.get("l", -1) <= 100:
+                self._set_state(level=payload["l"])
+            return STATUS_OK, None
+        if cmd_type == CMD_WRITE_RGB_COLOR:
+            self._set_state(color=tuple(payload.get(key, 0) for key in "rgb"))
+            return STATUS_OK, None
+        if cmd_type == CMD_WRITE_STATE:
+            level = payload.get("l")
+            color = None
+            if any(key in payload for key in "rgb"):
+                color = tuple(payload.get(key, 0) for key in "rgb")
+            self._set_state(
+                level=level if level is not None and 0 <= level <= 100 else None,
+                color=color,
+            )
+            return STATUS_OK, None
+        if cmd_type == CMD_PLAY_ANIMATION:
+            animation = payload.get("a")
+            if animation == _STOP_ANIMATION:
+                self.animation = None
+                return STATUS_OK, None
+            if isinstance(animation, int) and 0 <= animation <= _MAX_ANIMATION:
+                self.animation = animation
+                return STATUS_OK, None
+            return STATUS_ERROR, None
+        if cmd_type == CMD_WRITE_CUSTOMIZATION:
+            self.speed = payload.get("spd", self.speed)
+            self.brightness = payload.get("brg", self.brightness)
+            self.max_open = payload.get("mol", self.max_open)
+            return STATUS_OK, None
+        if cmd_type == CMD_READ_STATE:
+            r, g, b = self.color
+            return STATUS_OK, {"r": r, "g": g, "b": b, "l": self.level}
+        if cmd_type == CMD_READ_CUSTOMIZATION:
+            return STATUS_OK, {"spd": self.speed, "brg": self.brightness, "mol": self.max_open}
+        if cmd_type == CMD_READ_DEVICE_INFO:
+            return STATUS_OK, {
+                "n": self.name,
+                "m": self.model,
+                "fw": self.firmware,
+                "hw": self.hardware,
+                "sn": self.serial,
+            }
+        return STATUS_UNSUPPORTED, None
+
+    def _set_state(
+        self, level: int | None = None, color: tuple[int, int, int] | None = None
+    ) -> None:
+        """Change petals and color and notify the host."""
+        if level is not None:
+            self.level = level
+        if color is not None:
+            self.color = color
+            self.animation = None
+        if self.client is not None:
+            self.client.notify(CHAR_STATE, self._state_data())
+
+    def _state_data(self) -> bytes:
+        """Return StatePacketData for the current state."""
+        return STATE_DATA.pack(self.level, *self.color)
+
+    def _power_state(self) -> bytes:
+        """Return the Battery Power State value."""
+        return bytes(
+            [POWER_STATE_CHARGING if self.charging else POWER_STATE_DISCHARGING]
+        )
@@ -0,0 +1,88 @@
+"""Persistent storage for the Flower Light integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.device_info"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# Weight of a new measurement in the learned settle time of a firmware
+SETTLE_TIME_WEIGHT = 0.3
+
+
+class DeviceInfoCache:
+    """Device information cached across Home Assistant restarts.
+
+    Entries are keyed by BLE address and carry the firmware version they were
+    read from; a device reporting another firmware version refreshes them.
+    The cache also keeps how long each firmware needs to settle after a
+    connection is established.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._devices: dict[str, dict[str, Any]] = {}
+        self._settle_times: dict[str, float] = {}
+
+    async def async_load(self) -> None:
+        """Load the cache from disk."""
+        data = await self._store.async_load()
+        if data:
+            self._devices = data.get("devices", {})
+            self._settle_times = data.get("settle_times", {})
+        _LOGGER.debug("Loaded cached device info for %s devices", len(self._devices))
+
+    @callback
+    def async_get(self, address: str) -> dict[str, Any] | None:
+        """Return cached device information for an address."""
+        return self._devices.get(address.upper())
+
+    @callback
+    def async_update(self, address: str, info: dict[str, Any]) -> None:
+        """Store device information, ignoring info without a firmware version."""
+        if not info.get("firmware"):
+            return
+        address = address.upper()
+        if self._devices.get(address) == info:
+            return
+        self._devices[address] = dict(info)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, address: str) -> None:
+        """Forget cached device information for an address."""
+        if self._devices.pop(address.upper(), None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_get_settle_time(self, firmware: str | None) -> float | None:
+        """Return the learned settle time for a firmware version."""
+        if not firmware:
+            return None
+        return self._settle_times.get(firmware)
+
+    @callback
+    def async_record_settle_time(self, firmware: str | None, seconds: float | None) -> None:
+        """Blend a measured settle time into the value learned for a firmware."""
+        if not firmware or seconds is None:
+            return
+        learned = self._settle_times.get(firmware)
+        if learned is not None:
+            seconds = learned + (seconds - learned) * SETTLE_TIME_WEIGHT
+        self._settle_times[firmware] = round(seconds, 3)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"devices": self._devices, "settle_times": self._settle_times}
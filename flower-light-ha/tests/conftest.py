@@ -0,0 +1,19 @@
+"""Test setup for the Flower Light integration.
+
+The integration's modules are imported without Home Assistant: the
+integration directory is registered as the ``flower_light`` package without
+running its __init__.py. Run the tests from the repository with
+
+    python -m pytest flower-light-ha/tests
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import types
+
+_PACKAGE = "flower_light"
+if _PACKAGE not in sys.modules:
+    _module = types.ModuleType(_PACKAGE)
+    _module.__path__ = [str(Path(__file__).resolve().parent.parent)]
+    sys.modules[_PACKAGE] = _module
@@ -0,0 +1,45 @@
+"""Tests of the Flower Light state command filter."""
+from __future__ import annotations
+
+from flower_light.command_queue import StateDiff
+from flower_light.const import CMD_WRITE_PETALS, CMD_WRITE_RGB_COLOR, CMD_WRITE_STATE
+
+
+def _white(level: int) -> dict:
+    """Return a CMD_WRITE_STATE payload of dim white."""
+    return {"l": 50, "r": level, "g": level, "b": level, "t": 0}
+
+
+def test_unchanged_state_is_dropped() -> None:
+    """Test a command equal to the confirmed state is not sent."""
+    diff = StateDiff()
+    diff.confirm(_white(1))
+    assert diff.filter(CMD_WRITE_STATE, _white(1)) is None
+    assert diff.suppressed == 1
+
+
+def test_one_step_color_change_is_sent() -> None:
+    """Test small dimming steps at the low end are not taken as unchanged."""
+    diff = StateDiff()
+    diff.confirm(_white(1))
+    for level in (2, 3):
+        assert diff.filter(CMD_WRITE_STATE, _white(level)) == (
+            CMD_WRITE_RGB_COLOR,
+            {"r": level, "g": level, "b": level, "t": 0},
+        )
+        diff.confirm(_white(level))
+    assert diff.suppressed == 0
+
+
+def test_reported_rounding_keeps_sent_color() -> None:
+    """Test a reported color rounded by the firmware confirms the sent one."""
+    diff = StateDiff()
+    diff.confirm(_white(200))
+    diff.confirm_reported({"l": 50, "r": 199, "g": 201, "b": 200})
+    assert diff.filter(CMD_WRITE_STATE, _white(200)) is None
+
+    diff.confirm_reported({"l": 60, "r": 10, "g": 10, "b": 10})
+    assert diff.filter(CMD_WRITE_STATE, _white(10)) == (
+        CMD_WRITE_PETALS,
+        {"l": 50, "t": 0},
+    )
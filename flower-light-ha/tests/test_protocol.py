@@ -0,0 +1,53 @@
+"""Tests of the Flower Light packet encoding."""
+from __future__ import annotations
+
+import msgpack
+import pytest
+
+from flower_light import const, protocol
+
+# The fixed-shape commands sent by the device, as the light and number
+# entities send them
+COMMANDS = [
+    (const.CMD_WRITE_PETALS, {"l": 75, "t": 1000}),
+    (const.CMD_WRITE_RGB_COLOR, {"r": 255, "g": 128, "b": 0, "t": 500}),
+    (const.CMD_WRITE_STATE, {"l": 50, "r": 255, "g": 128, "b": 0, "t": 1000}),
+    (const.CMD_PLAY_ANIMATION, {"a": 2}),
+]
+
+
+@pytest.mark.parametrize(("cmd_type", "payload"), COMMANDS)
+def test_encoder_matches_encode_packet(cmd_type: int, payload: dict) -> None:
+    """Test the reused encoder produces the bytes of a one-off encode."""
+    encoder = protocol.PacketEncoder()
+    for message_id in (0, 1, 0xFFFF):
+        packet = encoder.encode(cmd_type, message_id, payload)
+        assert packet == protocol.encode_packet(cmd_type, message_id, payload)
+        header = protocol.HEADER.unpack_from(packet)
+        assert header == (cmd_type, message_id, len(packet) - protocol.HEADER_SIZE)
+        assert msgpack.unpackb(packet[protocol.HEADER_SIZE :]) == payload
+
+
+@pytest.mark.parametrize("payload", [{}, None])
+def test_empty_payload(payload: dict | None) -> None:
+    """Test an empty or missing payload is encoded as an empty map."""
+    packet = protocol.PacketEncoder().encode(const.CMD_WRITE_STATE, 7, payload)
+    assert packet == protocol.encode_packet(const.CMD_WRITE_STATE, 7, payload)
+    assert packet == protocol.HEADER.pack(const.CMD_WRITE_STATE, 7, 1) + b"\x80"
+
+
+def test_payload_size_limit() -> None:
+    """Test payloads up to MAX_PAYLOAD_BYTES are encoded and larger ones refused."""
+    encoder = protocol.PacketEncoder()
+    # A map with one string value: 1 byte map header, 2 byte key, 2 byte str8
+    # header, so the value length sets the payload size
+    largest = {"n": "x" * (protocol.MAX_PAYLOAD_BYTES - 5)}
+    packet = encoder.encode(const.CMD_WRITE_STATE, 1, largest)
+    assert len(packet) == protocol.HEADER_SIZE + protocol.MAX_PAYLOAD_BYTES
+    assert packet == protocol.encode_packet(const.CMD_WRITE_STATE, 1, largest)
+
+    too_large = {"n": "x" * (protocol.MAX_PAYLOAD_BYTES - 4)}
+    with pytest.raises(ValueError):
+        encoder.encode(const.CMD_WRITE_STATE, 1, too_large)
+    with pytest.raises(ValueError):
+        protocol.encode_packet(const.CMD_WRITE_STATE, 1, too_large)
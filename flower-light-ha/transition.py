@@ -0,0 +1,98 @@
+"""Host-side planning of transitions longer than the firmware supports."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+from .const import MAX_TRANSITION_MS
+
+# Largest difference between the eased curve and the firmware's linear fade,
+# per color channel (0-255) and petal level (0-100)
+TRANSITION_TOLERANCE = 2.0
+
+# Points checked inside a segment against the tolerance
+_SAMPLES = 16
+
+# Transition values as sent in CMD_WRITE_STATE: red, green, blue, petal level
+Values = tuple[float, float, float, float]
+
+EASINGS: dict[str, Callable[[float], float]] = {
+    "linear": lambda x: x,
+    "ease_in": lambda x: x * x,
+    "ease_out": lambda x: 1 - (1 - x) * (1 - x),
+    "ease_in_out": lambda x: x * x * (3 - 2 * x),
+}
+
+
+@dataclass(frozen=True)
+class Keyframe:
+    """State the firmware fades to, reached ``end_ms`` into the transition."""
+
+    end_ms: int
+    duration_ms: int
+    values: tuple[int, int, int, int]
+
+
+def _lerp(start: Values, end: Values, progress: float) -> Values:
+    """Interpolate between two value tuples."""
+    return tuple(a + (b - a) * progress for a, b in zip(start, end))
+
+
+def _segment_fits(
+    curve: Callable[[float], Values], start_ms: int, end_ms: int
+) -> bool:
+    """Return if a linear fade from start_ms to end_ms stays near the curve."""
+    first, last = curve(start_ms), curve(end_ms)
+    for i in range(1, _SAMPLES):
+        at = start_ms + (end_ms - start_ms) * i / _SAMPLES
+        linear = _lerp(first, last, i / _SAMPLES)
+        exact = curve(at)
+        if any(abs(a - b) > TRANSITION_TOLERANCE for a, b in zip(linear, exact)):
+            return False
+    return True
+
+
+def plan_transition(
+    start: Values,
+    end: Values,
+    duration_ms: int,
+    easing: str = "linear",
+    max_segment_ms: int = MAX_TRANSITION_MS,
+) -> list[Keyframe]:
+    """Split a transition into the fewest firmware fades that follow the easing.
+
+    The firmware fades linearly over at most ``max_segment_ms``. Each segment
+    is stretched as far as it can while the linear fade stays within
+    TRANSITION_TOLERANCE of the eased curve, which gives the minimum number of
+    segments for curves whose error grows with the segment length.
+    """
+    ease = EASINGS[easing]
+    duration_ms = max(0, int(duration_ms))
+    if duration_ms == 0:
+        return [Keyframe(0, 0, tuple(round(v) for v in end))]
+
+    def curve(at_ms: float) -> Values:
+        return _lerp(start, end, ease(min(1.0, at_ms / duration_ms)))
+
+    keyframes: list[Keyframe] = []
+    position = 0
+    while position < duration_ms:
+        longest = min(max_segment_ms, duration_ms - position)
+        if _segment_fits(curve, position, position + longest):
+            length = longest
+        else:
+            # Binary search the longest segment that still fits
+            low, high = 1, longest
+            while low < high:
+                mid = (low + high + 1) // 2
+                if _segment_fits(curve, position, position + mid):
+                    low = mid
+                else:
+                    high = mid - 1
+            length = low
+        position += length
+        keyframes.append(
+            Keyframe(position, length, tuple(round(v) for v in curve(position)))
+        )
+    return keyframes
+